@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal import SymbolTable, compile_source, execute
+from normal.columns import evaluate_columns
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The option chains from main.normal, plus a division that fails for option 4
+SOURCE = "\n".join([
+    "if (((option ^ 4) / 2) > 15) and (option - 2 <= 0): option is now 3",
+    "if (not (option * 3 > 8)): (if option + 1 < option: option is now 4 else: option is now 5) else: option is now 6",
+    "let ratio be 12 / (seed - 4)",
+    "if ratio > 2: ratio * option else if ratio < 0: 0 - ratio else: option"
+])
+
+def per_row(program, options, seeds):
+    results = []
+    for option, seed in zip(options, seeds):
+        table = SymbolTable()
+        table.declare("option", option, False)
+        table.declare("seed", seed, False)
+        results.append(execute(program, table))
+    
+    return results
+
+def check(rows, columns):
+    # Row by row, every statement must give the same value and error text
+    for row, results in enumerate(rows):
+        for statement, (value, error) in enumerate(results):
+            values, errors = columns.results[statement]
+            other = errors[row]
+            if (repr(value), error and error.as_string()) != (repr(values[row]), other and other.as_string()):
+                raise SystemExit(f"row {row}, statement {statement + 1}: {value!r} {error} != {values[row]!r} {other}")
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(1)
+    options = [random.randint(-3, 9) for _ in range(size)]
+    seeds = [random.randint(0, 9) for _ in range(size)]
+    columns = {"option": options, "seed": seeds}
+    if numpy is not None:
+        columns = {name: numpy.array(column) for name, column in columns.items()}
+    
+    for engine in ("tree", "vm", "closure"):
+        program = compile_source(SOURCE, engine)
+        start = time.perf_counter()
+        rows = per_row(program, options, seeds)
+        print(f"per-row {engine:<8} {size} rows  {time.perf_counter() - start:7.3f} s")
+    
+    start = time.perf_counter()
+    result = evaluate_columns(SOURCE, columns)
+    elapsed = time.perf_counter() - start
+    print(f"columns ({'numpy' if numpy is not None else 'lists'}) {size} rows  {elapsed:7.3f} s")
+
+    check(rows, result)
+    failed = sum(error is not None for error in result.errors())
+    print(f"results match, {failed} rows with errors")
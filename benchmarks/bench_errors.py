@@ -0,0 +1,65 @@
+import os
+import sys
+import timeit
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal import SymbolTable, compile_source, execute, program_cache
+
+# Cost of statements that succeed and of statements that fail, per engine.
+# Only compile_source and execute are used, and their results did not change
+# shape when errors became exceptions, so this script can be copied into an
+# older tree to compare the two.
+SETUP = "let x be 3\nlet y be 7\nlet f be 2.5\nconstant c is 4"
+
+SUCCEEDING = "\n".join([
+    "x * 2 + y - 1 > 4",
+    "f * 1.5 + x - 0.25 > 2.5",
+    "(x + y) * (y - x) / 2 ^ 2",
+    "if x > y: x - y else if x == y: 0 else: y - x",
+    "not (x >= y) and f != null",
+    "x is now x + 1 - 1",
+    "-x * 5 + -(y * f)"
+])
+
+FAILING = "\n".join([
+    "x + null",
+    "y / (x - 3)",
+    "missing * 2",
+    "c is now 5",
+    "let x be 1",
+    "f / 0",
+    "not_declared is now 1"
+])
+
+def run(engine, source):
+    program = compile_source(source, engine)
+    table = SymbolTable()
+    execute(compile_source(SETUP, engine), table)
+    return lambda: execute(program, table)
+
+def parse(engine, source):
+    def compile_cold():
+        program_cache.clear()
+        compile_source(source, engine)
+
+    return compile_cold
+
+def best(callable, number, repeat):
+    return min(timeit.repeat(callable, number=number, repeat=repeat)) / number
+
+if __name__ == "__main__":
+    arguments = ArgumentParser()
+    arguments.add_argument("--number", type=int, default=2000)
+    arguments.add_argument("--repeat", type=int, default=7)
+    options = arguments.parse_args()
+
+    for engine in ("tree", "vm", "closure"):
+        for label, make, source in [
+            ("compile", parse, SUCCEEDING),
+            ("succeeding", run, SUCCEEDING),
+            ("failing", run, FAILING)
+        ]:
+            seconds = best(make(engine, source), options.number, options.repeat)
+            print(f"{engine:<8} {label:<12} {seconds * 1e6:10.2f} us/program")
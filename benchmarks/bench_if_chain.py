@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal.interpreter import Lexer, Parser
+
+def else_if_chain(length):
+    branches = [f"option == {index}: (if option > {index}: option is now {index} else: {index} * 2)" for index in range(length)]
+    return "if " + " else if ".join(branches) + " else: 0 - 1"
+
+def bench(length):
+    tokens = Lexer(else_if_chain(length)).make_tokens()
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        Parser(tokens).generate_syntax_branch()
+        best = min(best, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    Parser(tokens).generate_syntax_branch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{length:>7} branches {len(tokens):>9} tokens  {best * 1e3:9.2f} ms  {best / len(tokens) * 1e9:8.1f} ns/token  peak {peak / 1024:10.1f} KiB  {peak / len(tokens):7.1f} B/token", flush=True)
+
+if __name__ == "__main__":
+    for length in [int(length) for length in sys.argv[1:]] or [100, 1000, 10000, 50000]:
+        bench(length)
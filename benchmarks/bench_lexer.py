@@ -0,0 +1,45 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal.interpreter import Lexer
+
+LINES = [
+    "let option{n} be {n}",
+    "if (((option{n} ^ 4) / 2) > 15) and (option{n} - 2 <= 0): option{n} is now 3",
+    "if (not (option{n} * 3 > 8)): (if option{n} + 1 < option{n}: option{n} is now 4 else: option{n} is now 5) else: option{n} is now 6",
+    "constant limit{n} is {n}.5 * -(2 + 3) != null == true"
+]
+
+def make_source(size):
+    random.seed(0)
+    lines = []
+    length = 0
+    n = 0
+    while length < size:
+        line = random.choice(LINES).format(n=n)
+        lines += [line]
+        length += len(line) + 1
+        n += 1
+
+    return "\n".join(lines)
+
+def bench(size, repeat=3):
+    text = make_source(size)
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = Lexer(text).make_tokens()
+        elapsed = time.perf_counter() - start
+        count = len(tokens)
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"{len(text) / 1e6:6.2f} MB  {count:>10} tokens  {best:8.3f} s  {count / best:>12,.0f} tokens/s")
+
+if __name__ == "__main__":
+    for megabytes in sys.argv[1:] or ["1", "4", "16"]:
+        bench(int(float(megabytes) * 1_000_000))
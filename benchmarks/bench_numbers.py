@@ -0,0 +1,63 @@
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal.interpreter import add, divide, greater, multiply, power, subtract
+
+# The float-and-back arithmetic every operator used before the numeric tower
+def legacy(operation):
+    def run(a, b):
+        res = operation(float(a), float(b))
+        return int(res) if res % 1 == 0 else res, None
+    
+    return run
+
+LEGACY = {
+    "add": legacy(lambda a, b: a + b),
+    "subtract": legacy(lambda a, b: a - b),
+    "multiply": legacy(lambda a, b: a * b),
+    "divide": legacy(lambda a, b: a / b),
+    "power": legacy(lambda a, b: a ** b)
+}
+
+OPERATIONS = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+    "power": power,
+    "greater": greater
+}
+
+OPERANDS = {
+    "int": (12345, 678),
+    "float": (123.45, 6.78),
+    "mixed": (12345, 6.78),
+    "big int": (3 ** 200, 7 ** 150),
+    "decimal": (Decimal("123.45"), Decimal("6.78"))
+}
+
+def rate(operation, a, b, number):
+    best = min(timeit.repeat(lambda: operation(a, b), number=number, repeat=5))
+    return number / best
+
+if __name__ == "__main__":
+    number = 200000
+    print(f"{'operator':<10} {'operands':<9} {'ops/s':>12} {'legacy ops/s':>14}")
+    for name, operation in OPERATIONS.items():
+        for kind, (a, b) in OPERANDS.items():
+            if name == "power":
+                # Keep exponents small enough to measure the operator, not the
+                # size of its result
+                b = 3 if kind != "float" else 1.5
+            
+            current = f"{rate(operation, a, b, number):>12,.0f}"
+            try:
+                previous = f"{rate(LEGACY[name], a, b, number):>14,.0f}" if name in LEGACY else f"{'-':>14}"
+            except (OverflowError, TypeError):
+                previous = f"{'fails':>14}"
+            
+            print(f"{name:<10} {kind:<9} {current} {previous}")
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal.interpreter import ENGINES, Lexer, Parser, SymbolTable, optimize, run_statement
+
+# Flat shapes only: the tree they produce is left-deep, which the parser and
+# every pass after it handle in a loop, while nesting depth is capped by
+# NESTING_LIMIT. Each expression is parsed, then compiled and run on every
+# engine.
+def operator_chain(terms):
+    operators = ["+", "*", "-", "/", "^"]
+    return " ".join(f"x{index % 10} {operators[index % len(operators)]}" for index in range(terms)) + " 1"
+
+def grouped_chain(terms):
+    return " * ".join(f"(x{index % 10} + {index})" for index in range(terms // 2))
+
+def precedence_ladder(terms):
+    # Climbing precedence then dropping back, with a parenthesis in each rung
+    return " or ".join(f"x{index % 10} and x1 == x2 + x3 * (x4) ^ 2" for index in range(terms // 14))
+
+def logical_chain(terms):
+    return " and ".join(f"not x{index % 10} < {index}" for index in range(terms // 2))
+
+SHAPES = {
+    "operator chain": operator_chain,
+    "grouped chain": grouped_chain,
+    "logical chain": logical_chain,
+    "ladder": precedence_ladder
+}
+
+def bench(name, shape, sizes):
+    table = SymbolTable()
+    for index in range(10):
+        table.declare(f"x{index}", index % 3 + 1, False)
+    
+    for size in sizes:
+        tokens = Lexer(shape(size)).make_tokens()
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            node = Parser(tokens).generate_syntax_branch()
+            best = min(best, time.perf_counter() - start)
+        
+        print(f"{name:<15} {len(tokens):>8} tokens  {best * 1e3:9.2f} ms  {best / len(tokens) * 1e9:8.1f} ns/token", flush=True)
+        for engine, (compile_program, execute_program) in ENGINES.items():
+            start = time.perf_counter()
+            program = compile_program(optimize(node))
+            compiled = time.perf_counter()
+            res, error = run_statement(execute_program, program, table)
+            executed = time.perf_counter()
+            outcome = error.as_string() if error else type(res).__name__
+            print(f"{'':<15} {engine:<8} compile {(compiled - start) * 1e3:9.2f} ms  run {(executed - compiled) * 1e3:9.2f} ms  {outcome}", flush=True)
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [1000, 10000, 100000, 200000]
+    for name, shape in SHAPES.items():
+        bench(name, shape, sizes)
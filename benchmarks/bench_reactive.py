@@ -0,0 +1,51 @@
+import os
+import sys
+import timeit
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal import ReactiveSession, Session
+
+# A sheet of inputs, each with a short chain of derived variables, plus a few
+# totals over every chain. Changing one input used to mean running the whole
+# file again ("rerun"); the reactive session only recomputes that input's
+# chain and the totals ("reactive").
+def sheet(inputs, depth):
+    lines = [f"let input{index} be {index}" for index in range(inputs)]
+    for index in range(inputs):
+        previous = f"input{index}"
+        for level in range(depth):
+            lines.append(f"let d{index}_{level} be {previous} * 2 + {level}")
+            previous = f"d{index}_{level}"
+
+    lines.append("let total0 be " + " + ".join(f"d{index}_{depth - 1}" for index in range(min(inputs, 50))))
+    lines.append("let total1 be total0 / 2")
+    return "\n".join(lines)
+
+def bench(engine, inputs, depth, number):
+    source = sheet(inputs, depth)
+    update = "input7 is now input7 + 1"
+
+    def rerun():
+        session = Session(engine)
+        session.run(source)
+        session.run(update)
+
+    reactive = ReactiveSession(engine)
+    reactive.run(source)
+    program = reactive.compile(update)
+
+    rerun_time = min(timeit.repeat(rerun, number=1, repeat=3))
+    reactive_time = min(timeit.repeat(lambda: reactive.execute(program), number=number, repeat=3)) / number
+    affected = len(reactive.graph.affected("input7"))
+    print(f"{engine:<8} {inputs:>6} inputs x {depth}  rerun {rerun_time * 1e3:10.2f} ms  reactive {reactive_time * 1e6:10.2f} us  {rerun_time / reactive_time:10,.0f}x  ({affected} recomputed)")
+
+if __name__ == "__main__":
+    arguments = ArgumentParser()
+    arguments.add_argument("--number", type=int, default=200)
+    options = arguments.parse_args()
+
+    for inputs in (100, 1000):
+        for engine in ("tree", "vm", "closure"):
+            bench(engine, inputs, 5, options.number)
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from normal.server import Client
+
+SNIPPETS = [
+    "option * 3 > 8",
+    "((option ^ 4) / 2) > 15",
+    "if option + 1 < option: 4 else if option > 100: 5 else: 6",
+    "1 + 2 * 3 - 4 / 5 + option * option - 7"
+]
+
+def connect(path, timeout=10):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return Client(path)
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+
+            time.sleep(0.01)
+
+def client(path, requests):
+    latencies = []
+    with connect(path) as session:
+        session.run("let option be 2")
+        for index in range(requests):
+            start = time.perf_counter()
+            reply = session.run(SNIPPETS[index % len(SNIPPETS)])
+            latencies.append(time.perf_counter() - start)
+            if "results" not in reply or reply["results"][0]["error"]:
+                raise RuntimeError(reply)
+
+    return latencies
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def bench(path, clients, requests):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        latencies = sorted(latency for result in pool.map(lambda _: client(path, requests), range(clients)) for latency in result)
+
+    elapsed = time.perf_counter() - start
+    print(f"{clients:>3} clients: p50 {percentile(latencies, 0.5) * 1e6:7.1f} us   p99 {percentile(latencies, 0.99) * 1e6:8.1f} us   {len(latencies) / elapsed:9,.0f} requests/s")
+
+if __name__ == "__main__":
+    arguments = ArgumentParser()
+    arguments.add_argument("--requests", type=int, default=2000)
+    arguments.add_argument("--engine", default="vm")
+    options = arguments.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "normal.sock")
+    server = subprocess.Popen([sys.executable, "-m", "normal", "serve", "--socket", path, "--engine", options.engine], cwd=ROOT)
+    try:
+        connect(path).close()
+        for clients in (1, 4, 16, 64):
+            bench(path, clients, options.requests)
+    finally:
+        server.terminate()
+        server.wait()
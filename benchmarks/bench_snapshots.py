@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal import SymbolTable
+
+# Takes a snapshot before every store, the way watch mode checkpoints every
+# statement, then rolls back through all of them. "journal" is the table's own
+# snapshot; "copy" copies the whole table each time, which is what snapshots
+# cost before they went through the undo journal.
+class CopyingTable(SymbolTable):
+    def snapshot(self):
+        return self.values[:], self.immutable[:]
+
+    def restore(self, snapshot):
+        values, immutable = snapshot
+        self.values[:] = values
+        self.immutable[:] = immutable
+
+def filled(kind, variables):
+    table = kind()
+    for index in range(variables):
+        table.declare(f"variable{index}", index, False)
+
+    return table
+
+def checkpoint(table, slots, snapshots):
+    checkpoints = []
+    for index in range(snapshots):
+        checkpoints.append(table.snapshot())
+        table.store(slots[index % len(slots)], index, False)
+
+    return checkpoints
+
+def bench(kind, variables, snapshots):
+    table = filled(kind, variables)
+    slots = [table.values.index(index) for index in range(variables)]
+    start = time.perf_counter()
+    checkpoints = checkpoint(table, slots, snapshots)
+    taken = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for snapshot in reversed(checkpoints):
+        table.restore(snapshot)
+
+    stepped = time.perf_counter() - start
+    if table.values[slots[0]] != 0:
+        raise RuntimeError("rollback did not restore the table")
+
+    # Memory is measured on a separate run, tracing would skew the timings
+    table = filled(kind, variables)
+    tracemalloc.start()
+    checkpoints = checkpoint(table, slots, snapshots)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{kind.__name__:<12} {taken * 1e9 / snapshots:10.0f} ns/snapshot {stepped * 1e9 / snapshots:10.0f} ns/rollback {memory / 1e6:10.2f} MB")
+
+if __name__ == "__main__":
+    arguments = ArgumentParser()
+    arguments.add_argument("--snapshots", type=int, default=100000)
+    options = arguments.parse_args()
+
+    for variables in (10, 100, 1000):
+        print(f"{variables} variables, {options.snapshots} snapshots")
+        for kind in (SymbolTable, CopyingTable):
+            bench(kind, variables, options.snapshots)
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Each child measures itself so interpreter start-up is kept out of the
+# import and first execution timings
+CHILD = """
+import time
+start = time.perf_counter()
+import normal
+imported = time.perf_counter()
+program = normal.compile_source("let option be 2\\nif option > 1: option * 3 else: 0")
+normal.execute(program)
+executed = time.perf_counter()
+print(imported - start, executed - imported)
+"""
+
+def measure(code, bytecode):
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    if not bytecode:
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+    
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return time.perf_counter() - start, output
+
+def bench(label, bytecode, repeat):
+    if bytecode:
+        # Warm the __pycache__ so every timed run loads compiled modules
+        measure(CHILD, True)
+    
+    walls, imports, firsts = [], [], []
+    for _ in range(repeat):
+        wall, output = measure(CHILD, bytecode)
+        imported, executed = map(float, output.split())
+        walls.append(wall)
+        imports.append(imported)
+        firsts.append(executed)
+    
+    print(f"{label:>14}: process {min(walls) * 1000:7.2f} ms   import {min(imports) * 1000:6.2f} ms   first execution {min(firsts) * 1000:6.3f} ms")
+
+if __name__ == "__main__":
+    repeat = 20
+    baseline = min(measure("pass", True)[0] for _ in range(repeat))
+    print(f"{'python -c pass':>14}: process {baseline * 1000:7.2f} ms")
+    bench("no bytecode", False, repeat)
+    bench("cached", True, repeat)
@@ -0,0 +1,44 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal.interpreter import Lexer, Parser, TYPE_NAMES
+from bench_lexer import make_source
+
+class LegacyToken:
+    # The pre-slots representation: a dict-backed object per token, string type
+    def __init__(self, type, value=None):
+        self.type = type
+        self.value = value
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return result, size, peak
+
+def bench(size):
+    text = make_source(size)
+    tokens = Lexer(text).make_tokens()
+
+    legacy, legacy_size, _ = measure(lambda: [LegacyToken(TYPE_NAMES[token.type], token.value) for token in tokens])
+    current, current_size, _ = measure(lambda: Lexer(text).make_tokens())
+    count = len(current)
+    print(f"{len(text) / 1e6:6.2f} MB source, {count} tokens")
+    print(f"  before: {legacy_size / 1e6:8.2f} MB  {count / (legacy_size / 1e6):>12,.0f} tokens/MB")
+    print(f"  after:  {current_size / 1e6:8.2f} MB  {count / (current_size / 1e6):>12,.0f} tokens/MB")
+
+    lines = [Lexer(line).make_tokens() for line in text.split("\n")[:2000]]
+    del legacy, current
+    _, _, peak = measure(lambda: [Parser(line).generate_syntax_branch() for line in lines])
+    print(f"  parser peak over {len(lines)} lines: {peak / 1e3:.1f} KB")
+
+if __name__ == "__main__":
+    for megabytes in sys.argv[1:] or ["1", "4"]:
+        bench(int(float(megabytes) * 1_000_000))
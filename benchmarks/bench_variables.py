@@ -0,0 +1,38 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal.interpreter import ENGINES, SymbolTable, optimize, parse
+
+def make_script(count):
+    lines = [f"let v{index} be {index}" for index in range(count)]
+    lines += [f"v{index} is now v{index} + v{(index * 7) % count} * 2 - v{(index * 3) % count}" for index in range(count)]
+    lines += [f"if v{index} > v{(index + 1) % count}: v{index} is now v{index} - 1 else: v{index} is now v{index} + 1" for index in range(count)]
+    return lines
+
+def bench(engine, lines, repeat):
+    compile_program, execute = ENGINES[engine]
+    declarations = []
+    programs = []
+    for line in lines:
+        program = compile_program(optimize(parse(line)))
+        (declarations if line.startswith("let") else programs).append(program)
+
+    table = SymbolTable()
+    for program in declarations:
+        execute(program, table)
+
+    def work():
+        for program in programs:
+            execute(program, table)
+
+    best = min(timeit.repeat(work, number=1, repeat=repeat))
+    print(f"{engine:<8} {len(programs)} statements  {best * 1e3:8.2f} ms  {len(programs) / best:>10,.0f} statements/s")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    lines = make_script(count)
+    for engine in ENGINES:
+        bench(engine, lines, 50)
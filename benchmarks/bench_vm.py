@@ -0,0 +1,32 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal.interpreter import Interpreter, SymbolTable, VirtualMachine, compile_closure, compile_node, execute_closure, parse
+
+SNIPPETS = [
+    "((option ^ 4) / 2) > 15",
+    "option * 3 > 8",
+    "1 + 2 * 3 - 4 / 5 + option * option - 7",
+    "if option + 1 < option: 4 else if option > 100: 5 else: 6"
+]
+
+def best_rate(function, iterations):
+    return iterations / min(timeit.repeat(function, number=iterations, repeat=5))
+
+def bench(snippet, iterations):
+    node = parse(snippet)
+    table = SymbolTable()
+    table.declare("option", 2, False)
+    tree = best_rate(Interpreter(node, table).run, iterations)
+    vm = best_rate(VirtualMachine(compile_node(node), table).run, iterations)
+    program = compile_closure(node)
+    closure = best_rate(lambda: execute_closure(program, table), iterations)
+    print(f"{snippet[:48]:<50} tree {tree:>10,.0f}/s  vm {vm:>10,.0f}/s  closure {closure:>10,.0f}/s")
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    for snippet in SNIPPETS:
+        bench(snippet, iterations)
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from corpus import many_variables
+from normal import SymbolTable, compile_source, execute, program_cache
+from normal.watch import IncrementalRun
+
+def full_run(text, engine):
+    program_cache.clear()
+    return execute(compile_source(text, engine), SymbolTable())
+
+def bench(count, engine):
+    lines = many_variables(count).split("\n")
+    run = IncrementalRun(engine)
+    run.update("\n".join(lines))
+
+    # Edit a line at 90%, 50% and 10% of the way through the file
+    for fraction in (0.9, 0.5, 0.1):
+        index = int(len(lines) * fraction)
+        lines[index] = lines[index] + " + 0"
+        text = "\n".join(lines)
+
+        start = time.perf_counter()
+        run.update(text)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = full_run(text, engine)
+        full = time.perf_counter() - start
+
+        if [repr(result) for result in results] != [repr(result) for result in run.results]:
+            raise SystemExit("incremental results differ from a full run")
+        
+        print(f"{engine:<8} {len(lines)} lines, edit at {fraction:.0%}: incremental {incremental * 1e3:8.2f} ms ({run.reparsed} reparsed, {run.executed} ran)  full {full * 1e3:8.2f} ms")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for engine in ("tree", "vm", "closure"):
+        bench(count, engine)
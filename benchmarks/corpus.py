@@ -0,0 +1,60 @@
+import random
+
+# Synthetic sources for the benchmark suite. Every generator is
+# deterministic for a given size so runs can be compared with a baseline.
+def deep_parens(depth):
+    return "let x be 1\nlet deep be " + "(" * depth + "x" + " + x)" * depth
+
+def operator_chain(length):
+    operators = ["+", "-", "*", "/"]
+    terms = ["x"]
+    for index in range(length):
+        terms.append(operators[index % len(operators)])
+        terms.append("x" if index % 2 else str(index % 7 + 1))
+    
+    return "let x be 3\nlet chain be " + " ".join(terms)
+
+def else_if_chain(length):
+    branches = [f"option == {index}: {index} * 2" for index in range(length)]
+    return "let option be 7\nif " + " else if ".join(branches) + " else: 0 - 1"
+
+def many_variables(count):
+    lines = [f"let v{index} be {index}" for index in range(count)]
+    lines += [f"v{index} is now v{index} + v{(index * 7) % count} * 2" for index in range(count)]
+    lines += [f"if v{index} > v{(index + 1) % count}: v{index} is now v{index} - 1 else: v{index} is now v{index} + 1" for index in range(count)]
+    return "\n".join(lines)
+
+LINES = [
+    "let option{n} be {n}",
+    "if (((option{n} ^ 4) / 2) > 15) and (option{n} - 2 <= 0): option{n} is now 3",
+    "if (not (option{n} * 3 > 8)): (if option{n} + 1 < option{n}: option{n} is now 4 else: option{n} is now 5) else: option{n} is now 6",
+    "constant limit{n} is {n}.5 * (2 + 3) != null == true"
+]
+
+def large_file(megabytes):
+    generator = random.Random(megabytes)
+    lines = []
+    size = 0
+    index = 0
+    while size < megabytes * 1024 * 1024:
+        # Keep declarations ahead of the lines that use them
+        if index % len(LINES) == 0:
+            number = generator.randint(0, 10 ** 6)
+        
+        line = LINES[index % len(LINES)].format(n=number)
+        lines.append(line)
+        size += len(line) + 1
+        index += 1
+    
+    return "\n".join(lines)
+
+# name: (generator, size, quick size). Chains and else if branches run in a
+# loop at any length; deep_parens nests one group per step, so it stays
+# under the parser's NESTING_LIMIT.
+CORPUS = {
+    "deep_parens": (deep_parens, 90, 50),
+    "operator_chain": (operator_chain, 20000, 500),
+    "else_if_chain": (else_if_chain, 3000, 300),
+    "many_variables": (many_variables, 2000, 200),
+    "large_file": (large_file, 2, 0.1)
+}
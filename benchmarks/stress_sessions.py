@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from normal import ENGINES, Session, compile_source
+
+# Every session runs the same compiled program against its own seed; the
+# expected values are worked out in Python so any leak between sessions shows
+SOURCE = "\n".join([
+    "let total be seed * 2",
+    "total is now total + 1",
+    "let big be total > 1000",
+    "if big: total is now total - 1000 else if total > 500: total is now total - 500 else: total is now total + 7",
+    "constant doubled is total * 2",
+    "total + doubled",
+    "leak"
+])
+
+def expected(seed):
+    total = seed * 2 + 1
+    if total > 1000:
+        total -= 1000
+    elif total > 500:
+        total -= 500
+    else:
+        total += 7
+    
+    return total + total * 2
+
+def work(engine, program, seed):
+    session = Session(engine)
+    session.table.declare("seed", seed, True)
+    results = session.execute(program[engine])
+    for line, (value, error) in enumerate(results[:5], 1):
+        if error:
+            return f"session {seed}: line {line} failed with {error.as_string()}"
+    
+    value, error = results[5]
+    if error or value != expected(seed):
+        return f"session {seed}: expected {expected(seed)}, got {value!r}"
+    
+    if results[6][1] is None:
+        return f"session {seed}: saw a variable it never declared"
+    
+    # Names private to one session are compiled concurrently, and only ever
+    # get slots in that session's table
+    declared, other = session.run(f"let own{seed} be total\nown{seed - 1}")
+    if declared[1] or other[1] is None:
+        return f"session {seed}: saw the variable of session {seed - 1}"
+    
+    return None
+
+def main():
+    arguments = ArgumentParser()
+    arguments.add_argument("--sessions", type=int, default=5000)
+    arguments.add_argument("--workers", type=int, default=16)
+    options = arguments.parse_args()
+
+    # Switch threads as often as possible to shake out races
+    sys.setswitchinterval(1e-6)
+    program = {engine: compile_source(SOURCE, engine) for engine in ENGINES}
+    engines = list(ENGINES)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(options.workers) as pool:
+        failures = [failure for failure in pool.map(
+            lambda seed: work(engines[seed % len(engines)], program, seed),
+            range(options.sessions)
+        ) if failure]
+    
+    elapsed = time.perf_counter() - start
+    print(f"{options.sessions} sessions on {options.workers} threads: {elapsed:.2f} s, {options.sessions / elapsed:,.0f} sessions/s")
+    for failure in failures[:10]:
+        print(failure)
+    
+    print(f"{len(failures)} failures")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
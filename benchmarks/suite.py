@@ -0,0 +1,145 @@
+import json
+import os
+import platform
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from corpus import CORPUS
+from normal import ENGINES, DEFAULT_ENGINE, Error, SymbolTable, compile_source, execute, optimize, program_cache
+from normal.interpreter import Lexer, Parser
+
+PHASES = ["lex", "parse", "compile", "evaluate", "end_to_end"]
+
+def best(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    
+    return min(times)
+
+def measure(source, engine, repeat):
+    lines = [line for line in source.split("\n") if line.strip()]
+    compile_program, execute_program = ENGINES[engine]
+
+    tokens = [Lexer(line).make_tokens() for line in lines]
+    nodes = [Parser(line_tokens).generate_syntax_branch() for line_tokens in tokens]
+    programs = [compile_program(optimize(node)) for node in nodes]
+
+    def evaluate():
+        table = SymbolTable()
+        for program in programs:
+            # A few generated statements fail, as they would in a real run
+            try:
+                execute_program(program, table)
+            except Error:
+                pass
+    
+    def end_to_end():
+        # A cold cache, so every line is lexed, parsed and compiled again
+        program_cache.clear()
+        execute(compile_source(source, engine), SymbolTable())
+    
+    timings = {
+        "lex": best(lambda: [Lexer(line).make_tokens() for line in lines], repeat),
+        "parse": best(lambda: [Parser(line_tokens).generate_syntax_branch() for line_tokens in tokens], repeat),
+        "compile": best(lambda: [compile_program(optimize(node)) for node in nodes], repeat),
+        "evaluate": best(evaluate, repeat),
+        "end_to_end": best(end_to_end, repeat)
+    }
+    return timings
+
+def run(cases, engine, repeat, quick):
+    results = {}
+    for name in cases:
+        generator, size, quick_size = CORPUS[name]
+        source = generator(quick_size if quick else size)
+        try:
+            results[name] = measure(source, engine, repeat)
+        except Error as error:
+            results[name] = {"error": error.as_string()}
+        
+        timings = results[name]
+        if "error" in timings:
+            print(f"{name:<16} {timings['error']}", flush=True)
+        else:
+            print(f"{name:<16} " + "  ".join(f"{phase} {timings[phase] * 1e3:9.2f} ms" for phase in PHASES), flush=True)
+    
+    return results
+
+def compare(results, baseline, threshold, thresholds):
+    # A phase regresses when it is slower than the baseline by more than its
+    # threshold, given as a fraction (0.1 means 10% slower)
+    regressions = []
+    for name, timings in results.items():
+        previous = baseline["cases"].get(name, {})
+        for phase in PHASES:
+            if phase not in timings or phase not in previous:
+                continue
+            
+            ratio = timings[phase] / previous[phase] if previous[phase] else 1
+            limit = thresholds.get(phase, threshold)
+            status = "REGRESSION" if ratio > 1 + limit else "ok"
+            print(f"{name:<16} {phase:<11} {previous[phase] * 1e3:9.2f} ms -> {timings[phase] * 1e3:9.2f} ms  {ratio:6.2f}x  {status}")
+            if status != "ok":
+                regressions.append((name, phase, ratio))
+    
+    return regressions
+
+def parse_thresholds(items):
+    thresholds = {}
+    for item in items:
+        phase, _, value = item.partition("=")
+        if phase not in PHASES:
+            raise SystemExit(f"Unknown phase '{phase}', expected one of {', '.join(PHASES)}")
+        
+        thresholds[phase] = float(value)
+    
+    return thresholds
+
+def main():
+    arguments = ArgumentParser()
+    arguments.add_argument("--case", action="append", choices=list(CORPUS), help="run only these cases")
+    arguments.add_argument("--engine", choices=list(ENGINES), default=DEFAULT_ENGINE)
+    arguments.add_argument("--repeat", type=int, default=5)
+    arguments.add_argument("--quick", action="store_true", help="use small corpus sizes")
+    arguments.add_argument("--save", help="write results as JSON to this path")
+    arguments.add_argument("--baseline", help="compare against results saved with --save")
+    arguments.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown, as a fraction")
+    arguments.add_argument("--phase-threshold", action="append", default=[], metavar="PHASE=FRACTION")
+    options = arguments.parse_args()
+
+    cases = options.case or list(CORPUS)
+    results = run(cases, options.engine, options.repeat, options.quick)
+    report = {
+        "meta": {
+            "engine": options.engine,
+            "repeat": options.repeat,
+            "quick": options.quick,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "cases": results
+    }
+
+    if options.save:
+        with open(options.save, "w") as file:
+            json.dump(report, file, indent=2)
+    
+    if options.baseline:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+        
+        regressions = compare(results, baseline, options.threshold, parse_thresholds(options.phase_threshold))
+        print(f"{len(regressions)} regressions")
+        return 1 if regressions else 0
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+from .interpreter import (
+    DEFAULT_ENGINE,
+    ENGINES,
+    Error,
+    MathError,
+    NormalSyntaxError,
+    NormalTypeError,
+    Program,
+    Session,
+    Statement,
+    SymbolTable,
+    VariableError,
+    compile_source,
+    execute,
+    optimize,
+    output_of,
+    parse,
+    program_cache,
+    run,
+    run_file,
+    set_decimal_mode,
+    symbol_table,
+    to_text
+)
+from .columns import ColumnResult, evaluate_columns
+from .profiler import Profile, profile_file, profile_source
+from .reactive import DependencyGraph, ReactiveSession, run_reactive_file
@@ -0,0 +1,146 @@
+import json
+import sys
+import time
+from argparse import ArgumentParser, ArgumentTypeError
+
+from .interpreter import DEFAULT_ENGINE, ENGINES, run_file, set_decimal_mode
+
+def positive(text):
+    value = int(text)
+    if value < 1:
+        raise ArgumentTypeError(f"must be at least 1, got {value}")
+    
+    return value
+
+def run_many_command(argv):
+    # Imported here so plain runs never load concurrent.futures
+    from .batch import expand, run_many
+
+    arguments = ArgumentParser(prog="normal run-many")
+    arguments.add_argument("patterns", nargs="+", metavar="dir-or-glob")
+    arguments.add_argument("--engine", choices=list(ENGINES), default=DEFAULT_ENGINE)
+    arguments.add_argument("--workers", type=positive, default=None)
+    arguments.add_argument("--chunk-size", type=positive, default=1)
+    arguments.add_argument("--fail-fast", action="store_true")
+    options = arguments.parse_args(argv)
+
+    paths = expand(options.patterns)
+    files = statements = failed = size = 0
+    start = time.perf_counter()
+    for result in run_many(paths, options.engine, options.workers, options.chunk_size, options.fail_fast):
+        print(f"==> {result.path} <==")
+        for line in result.output:
+            print(line)
+        
+        print(f"-- {result.statements} statements, {result.errors} errors, {result.elapsed * 1000:.2f} ms", flush=True)
+        files += 1
+        statements += result.statements
+        failed += result.failed
+        size += result.size
+    
+    elapsed = time.perf_counter() - start
+    rate = 1 / elapsed if elapsed else 0
+    print(f"{files} files, {statements} statements, {failed} failed in {elapsed:.2f} s "
+          f"({files * rate:,.0f} files/s, {statements * rate:,.0f} statements/s, {size * rate / 1e6:.2f} MB/s)")
+    return 1 if failed else 0
+
+def serve_command(argv):
+    # Imported here so plain runs never load the socket machinery
+    from .server import serve
+
+    arguments = ArgumentParser(prog="normal serve")
+    arguments.add_argument("--socket", default="normal.sock")
+    arguments.add_argument("--engine", choices=list(ENGINES), default=DEFAULT_ENGINE)
+    options = arguments.parse_args(argv)
+
+    try:
+        serve(options.socket, options.engine)
+    except FileExistsError as error:
+        arguments.error(str(error))
+    
+    return 0
+
+def profile_command(files, options):
+    from .profiler import profile_file
+
+    profiles = {}
+    for file in files:
+        _, profile = profile_file(file)
+        print(f"\n==> profile of {file} <==")
+        print(profile.table(options.profile_sort))
+        profiles[file] = profile.as_dict()
+    
+    if options.profile_json:
+        with open(options.profile_json, "w") as file:
+            json.dump(profiles, file, indent=2)
+    
+    return 0
+
+def reactive_command(files, options):
+    from .reactive import ReactiveSession, run_reactive_file
+
+    # One session for all files, the way plain runs share the symbol table
+    session = ReactiveSession(options.engine)
+    for file in files:
+        run_reactive_file(file, session)
+    
+    return 0
+
+def watch_command(argv):
+    from .watch import watch
+
+    arguments = ArgumentParser(prog="normal watch")
+    arguments.add_argument("file")
+    arguments.add_argument("--engine", choices=list(ENGINES), default=DEFAULT_ENGINE)
+    arguments.add_argument("--interval", type=float, default=0.5, help="seconds between checks for changes")
+    options = arguments.parse_args(argv)
+
+    try:
+        watch(options.file, options.engine, options.interval)
+    except KeyboardInterrupt:
+        pass
+    
+    return 0
+
+COMMANDS = {
+    "run-many": run_many_command,
+    "watch": watch_command,
+    "serve": serve_command
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    
+    arguments = ArgumentParser(prog="normal")
+    arguments.add_argument("files", nargs="*")
+    arguments.add_argument("--engine", choices=list(ENGINES), default=DEFAULT_ENGINE)
+    arguments.add_argument("--decimal", action="store_true", help="use Decimal instead of float for inexact results")
+    arguments.add_argument("--decimal-precision", type=int, metavar="DIGITS", help="significant digits of Decimal results (implies --decimal)")
+    arguments.add_argument("--profile", action="store_true", help="time every line and operator (uses the tree engine)")
+    arguments.add_argument("--profile-sort", choices=["time", "count", "name", "line", "lex", "parse", "evaluate"], default="time")
+    arguments.add_argument("--profile-json", metavar="PATH", help="also write the profile as JSON")
+    arguments.add_argument("--reactive", action="store_true", help="recompute variables declared from others whenever those change")
+    options = arguments.parse_args(argv)
+
+    files = options.files
+    if not files:
+        files = [f"{input('Which file do you want to run? ')}.normal"]
+    
+    if options.decimal or options.decimal_precision is not None:
+        set_decimal_mode(True, options.decimal_precision)
+    
+    if options.profile:
+        return profile_command(files, options)
+    
+    if options.reactive:
+        return reactive_command(files, options)
+    
+    for file in files:
+        run_file(file, engine=options.engine)
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
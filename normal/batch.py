@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from itertools import repeat
+
+from .interpreter import DEFAULT_ENGINE, Session, output_of
+
+class FileResult:
+    __slots__ = ("path", "output", "statements", "errors", "elapsed", "size")
+
+    def __init__(self, path, output, statements, errors, elapsed, size):
+        self.path = path
+        self.output = output
+        self.statements = statements
+        self.errors = errors
+        self.elapsed = elapsed
+        self.size = size
+    
+    @property
+    def failed(self):
+        return self.errors > 0
+    
+    def __repr__(self):
+        return f"(FILE {self.path}: {self.statements} statements, {self.errors} errors, {self.elapsed * 1000:.2f} ms)"
+
+def expand(patterns):
+    # A directory means every .normal file below it; anything else is a glob,
+    # so a plain file name matches itself. Order is sorted and stable so runs
+    # are reproducible
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob(os.path.join(pattern, "**", "*.normal"), recursive=True)
+        else:
+            matches = glob(pattern, recursive=True) or [pattern]
+        
+        paths.extend(sorted(matches))
+    
+    return paths
+
+def run_path(path, engine=DEFAULT_ENGINE):
+    # Each file gets a fresh session so files never see each other's variables
+    start = time.perf_counter()
+    try:
+        with open(path) as file:
+            text = file.read()
+    except OSError as error:
+        return FileResult(path, [f"FileError: {error.strerror}"], 0, 1, time.perf_counter() - start, 0)
+    
+    session = Session(engine)
+    program = session.compile(text)
+    results = session.execute(program)
+    output = []
+    errors = 0
+    for statement, (res, error) in zip(program.statements, results):
+        if error:
+            errors += 1
+        
+        line = output_of(statement.node, res, error)
+        if line is not None:
+            output.append(line)
+    
+    return FileResult(path, output, len(program.statements), errors, time.perf_counter() - start, len(text))
+
+def run_many(paths, engine=DEFAULT_ENGINE, workers=None, chunk_size=1, fail_fast=False):
+    # Results come back in the order of paths however the workers finish,
+    # so output is the same from run to run
+    if workers == 1:
+        for path in paths:
+            result = run_path(path, engine)
+            yield result
+            if fail_fast and result.failed:
+                return
+        
+        return
+    
+    executor = ProcessPoolExecutor(workers)
+    try:
+        for result in executor.map(run_path, paths, repeat(engine), chunksize=chunk_size):
+            yield result
+            if fail_fast and result.failed:
+                return
+    finally:
+        executor.shutdown(cancel_futures=True)
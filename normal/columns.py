@@ -0,0 +1,348 @@
+from .interpreter import (
+    Error,
+    IfChain,
+    Literal,
+    LogicalOperation,
+    MAX_INT_BITS,
+    Name,
+    BinaryOperation,
+    UnaryOperation,
+    UNARY_OPERATIONS,
+    OPERATIONS,
+    TT_AND,
+    TT_PLUS,
+    TT_MINUS,
+    TT_MUL,
+    TT_GT,
+    TT_ST,
+    UNDEFINED,
+    VariableDeclaration,
+    VariableUpdate,
+    compile_source,
+    constant_error,
+    optimize,
+    redeclared_error,
+    undeclared_error,
+    undefined_error,
+    unchain
+)
+
+# Column evaluation
+# A program runs once over whole columns instead of once per row. Every node
+# is visited a single time for a set of rows and produces a value column plus
+# an error column (None while no row has failed). Rows only reach the branches
+# their own conditions select, so side effects and errors match running the
+# scalar interpreter row by row; the scalar operations are reused for anything
+# the fast paths below do not cover. Arithmetic is only inlined for columns of
+# plain ints, where it is exact.
+def integers(column):
+    return all(type(value) is int for value in column)
+
+def products_fit(left, right):
+    # Otherwise the scalar multiply finds the rows that outgrow MAX_INT_BITS
+    return not left or max(map(int.bit_length, left)) + max(map(int.bit_length, right)) <= MAX_INT_BITS
+
+FAST_OPERATIONS = {
+    TT_PLUS: lambda left, right: [a + b for a, b in zip(left, right)] if integers(left) and integers(right) else None,
+    TT_MINUS: lambda left, right: [a - b for a, b in zip(left, right)] if integers(left) and integers(right) else None,
+    TT_MUL: lambda left, right: [a * b for a, b in zip(left, right)] if integers(left) and integers(right) and products_fit(left, right) else None,
+    TT_GT: lambda left, right: [a > b for a, b in zip(left, right)],
+    TT_ST: lambda left, right: [a < b for a, b in zip(left, right)]
+}
+
+class ColumnResult:
+    __slots__ = ("results", "columns", "size")
+
+    def __init__(self, results, columns, size):
+        self.results = results
+        self.columns = columns
+        self.size = size
+
+    def errors(self):
+        # The first error of every row, in statement order
+        errors = [None] * self.size
+        for _, column in self.results:
+            for row, error in enumerate(column):
+                if error is not None and errors[row] is None:
+                    errors[row] = error
+
+        return errors
+
+    def variables(self):
+        variables = {}
+        for name, column in self.columns.items():
+            if any(value is not UNDEFINED for value in column):
+                variables[name] = [None if value is UNDEFINED else value for value in column]
+
+        return variables
+
+    def __repr__(self):
+        return f"(COLUMN RESULT: {len(self.results)} statements, {self.size} rows)"
+
+class ColumnEvaluator:
+    def __init__(self, columns, size):
+        self.columns = columns
+        self.immutable = {}
+        self.size = size
+        self.all = range(size)
+        # (name, row, old value, old flag) for every store of the current
+        # statement, so rows where it fails can be put back
+        self.journal = []
+
+    def column(self, name):
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = [UNDEFINED] * self.size
+            self.immutable[name] = bytearray(self.size)
+
+        return column
+
+    def visit(self, node, rows):
+        return COLUMN_VISITORS[type(node)](self, node, rows)
+
+    def run_literal(self, node, rows):
+        return [node.value] * len(rows), None
+
+    def run_name(self, node, rows):
+        column = self.column(node.name)
+        values = column[:] if rows is self.all else [column[row] for row in rows]
+        if UNDEFINED not in values:
+            return values, None
+
+        errors = [undefined_error(node.name).at(node.span) if value is UNDEFINED else None for value in values]
+        return [None if value is UNDEFINED else value for value in values], errors
+
+    def run_unary(self, node, rows):
+        operands, errors = self.visit(node.operand, rows)
+        return self.apply(UNARY_OPERATIONS[node.operator], [operands], errors, node.span)
+
+    def run_chain(self, node, rows):
+        # Operations take the columns of everything below them in the chain,
+        # so a long chain is a loop rather than one call per operation
+        bottom, operations = unchain(node)
+        values, errors = self.visit(bottom, rows)
+        for operation in operations:
+            if type(operation) is LogicalOperation:
+                values, errors = self.logical(operation, rows, values, errors)
+            else:
+                values, errors = self.binary(operation, rows, values, errors)
+
+        return values, errors
+
+    def binary(self, node, rows, left, errors):
+        if errors is None:
+            right, errors = self.visit(node.right, rows)
+        else:
+            # Rows whose left operand failed never evaluate the right one
+            right = [None] * len(left)
+            positions = [position for position, error in enumerate(errors) if error is None]
+            errors = self.scatter(node.right, rows, positions, right, errors[:]) if positions else errors
+
+        fast = FAST_OPERATIONS.get(node.operator)
+        if fast is not None and errors is None and None not in left and None not in right:
+            values = fast(left, right)
+            if values is not None:
+                return values, None
+
+        return self.apply(OPERATIONS[node.operator], [left, right], errors, node.span)
+
+    def apply(self, operation, operands, errors, span):
+        if errors is None:
+            try:
+                return [operation(*arguments) for arguments in zip(*operands)], None
+            except Error:
+                # At least one row fails, so go row by row
+                errors = [None] * len(operands[0])
+
+        values = []
+        failed = errors[:]
+        for position, arguments in enumerate(zip(*operands)):
+            if errors[position] is not None:
+                values.append(None)
+                continue
+
+            try:
+                values.append(operation(*arguments))
+            except Error as error:
+                values.append(None)
+                failed[position] = error.at(span)
+
+        return values, failed if any(failed) else None
+
+    def logical(self, node, rows, left, errors):
+        short = not (node.operator == TT_AND)
+        values = [None] * len(left)
+        failed = errors[:] if errors is not None else None
+        pending = []
+        for position, value in enumerate(left):
+            if errors is not None and errors[position] is not None:
+                continue
+
+            if bool(value) == short:
+                values[position] = short
+            else:
+                pending.append(position)
+
+        if pending:
+            right, right_errors = self.visit(node.right, self.select(rows, pending))
+            for index, position in enumerate(pending):
+                if right_errors is not None and right_errors[index] is not None:
+                    if failed is None:
+                        failed = [None] * len(values)
+
+                    failed[position] = right_errors[index]
+                else:
+                    values[position] = bool(right[index])
+
+        return values, failed
+
+    def run_if(self, node, rows):
+        values = [None] * len(rows)
+        failed = None
+        pending = list(range(len(rows)))
+        for condition_branch, value_branch in node.branches:
+            if not pending:
+                break
+
+            conditions, errors = self.visit(condition_branch, self.select(rows, pending))
+            taken = []
+            remaining = []
+            for index, position in enumerate(pending):
+                if errors is not None and errors[index] is not None:
+                    if failed is None:
+                        failed = [None] * len(values)
+
+                    failed[position] = errors[index]
+                elif conditions[index]:
+                    taken.append(position)
+                else:
+                    remaining.append(position)
+
+            if taken:
+                failed = self.scatter(value_branch, rows, taken, values, failed)
+
+            pending = remaining
+
+        if pending and node.else_case is not None:
+            failed = self.scatter(node.else_case, rows, pending, values, failed)
+
+        return values, failed
+
+    def scatter(self, node, rows, positions, values, failed):
+        results, errors = self.visit(node, self.select(rows, positions))
+        for index, position in enumerate(positions):
+            values[position] = results[index]
+            if errors is not None and errors[index] is not None:
+                if failed is None:
+                    failed = [None] * len(values)
+
+                failed[position] = errors[index]
+
+        return failed
+
+    def select(self, rows, positions):
+        if len(positions) == len(rows):
+            return rows
+
+        return [rows[position] for position in positions]
+
+    def run_variable_declaration(self, node, rows):
+        return self.store(node, rows, True)
+
+    def run_variable_update(self, node, rows):
+        return self.store(node, rows, False)
+
+    def store(self, node, rows, declaration):
+        values, errors = self.visit(node.value, rows)
+        column = self.column(node.name)
+        immutable = self.immutable[node.name]
+        constant = declaration and node.immutable
+        failed = errors[:] if errors is not None else None
+        for position, row in enumerate(rows):
+            if errors is not None and errors[position] is not None:
+                continue
+
+            # The same checks, in the same order, as SymbolTable.declare_slot,
+            # assign_slot and store
+            error = None
+            if declaration:
+                if not constant and column[row] is not UNDEFINED:
+                    error = redeclared_error(node.name)
+            elif column[row] is UNDEFINED:
+                error = undeclared_error(node.name)
+
+            if error is None and immutable[row]:
+                error = constant_error(node.name)
+
+            if error is None:
+                self.journal.append((node.name, row, column[row], immutable[row]))
+                column[row] = values[position]
+                immutable[row] = constant
+                continue
+
+            values[position] = None
+            if failed is None:
+                failed = [None] * len(values)
+
+            failed[position] = error.at(node.span)
+
+        return values, failed
+
+    def rollback(self, errors):
+        # Same as run_statement: a row where the statement failed keeps none
+        # of the stores the statement made
+        for name, row, value, flag in reversed(self.journal):
+            if errors[row] is not None:
+                self.columns[name][row] = value
+                self.immutable[name][row] = flag
+
+        self.journal.clear()
+
+COLUMN_VISITORS = {
+    Literal: ColumnEvaluator.run_literal,
+    Name: ColumnEvaluator.run_name,
+    UnaryOperation: ColumnEvaluator.run_unary,
+    BinaryOperation: ColumnEvaluator.run_chain,
+    LogicalOperation: ColumnEvaluator.run_chain,
+    VariableDeclaration: ColumnEvaluator.run_variable_declaration,
+    VariableUpdate: ColumnEvaluator.run_variable_update,
+    IfChain: ColumnEvaluator.run_if
+}
+
+def evaluate_columns(program, columns, size=None):
+    # Columns may be lists or anything with tolist(), such as NumPy arrays;
+    # converting to Python scalars keeps the scalar number semantics exact
+    if isinstance(program, str):
+        program = compile_source(program, "tree")
+
+    inputs = {}
+    for name, column in columns.items():
+        inputs[name] = list(column.tolist() if hasattr(column, "tolist") else column)
+
+    sizes = {len(column) for column in inputs.values()}
+    if size is not None:
+        sizes.add(size)
+
+    if len(sizes) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(sizes)}")
+
+    size = sizes.pop() if sizes else 0
+    evaluator = ColumnEvaluator({}, size)
+    for name, column in inputs.items():
+        evaluator.column(name)[:] = column
+
+    results = []
+    for statement in program.statements:
+        if statement.error:
+            results.append(([None] * size, [statement.error] * size))
+            continue
+
+        values, errors = evaluator.visit(optimize(statement.node), evaluator.all)
+        if errors is None:
+            evaluator.journal.clear()
+        else:
+            evaluator.rollback(errors)
+
+        results.append((values, [None] * size if errors is None else errors))
+
+    return ColumnResult(results, evaluator.columns, size)
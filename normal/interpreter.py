@@ -1,1030 +1,2316 @@
-from string import ascii_letters
-
-DIGITS = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9"]
-LETTERS = list(ascii_letters)
-KEYWORDS = [
-    "variable",
-    "is",
-    "let",
-    "now",
-    "be",
-    "constant",
-    "and",
-    "or",
-    "not",
-    "if",
-    "else"
-]
-
-OFFICIAL_DATA_TYPES = [
-    "NUMBER",
-    "BOOLEAN",
-    "NULL"
-]
-
-NONE_VALUES_DICT = {
-    "PLUS": "+",
-    "MINUS": "-",
-    "MUL": "*",
-    "DIV": "/",
-    "POW": "^",
-    "LPAREN": "(",
-    "RPAREN": ")",
-    "EE": "=",
-    "NE": "!",
-    "GT": ">",
-    "LT": "<",
-    "GE": ">",
-    "LE": "<",
-    "COLON": ":"
-}
-
-# Errors
-class Error:
-    def __init__(self, error, reason):
-        self.error = error
-        self.reason = reason
-    
-    def as_string(self):
-        return f"{self.error}: {self.reason}"
-
-    def __repr__(self):
-        return f"(ERROR {self.error}: {self.reason})"
-
-# Basic components
-class Token:
-    def __init__(self, type, value=None):
-        self.type = type
-        self.value = value
-    
-    def __eq__(self, value):
-        if not isinstance(value, Token):
-            return translate_boolean(False)
-        
-        if self.type != value.type:
-            return translate_boolean(False)
-
-        if self.value != None and value.value != None:
-            if self.value != value.value:
-                return translate_boolean(False)
-            
-            return translate_boolean(True)
-        
-        if value.value == None:
-            return translate_boolean(True)
-        
-        return translate_boolean(self.value == value.value)
-
-    def __ne__(self, value):
-        return translate_boolean(not translate_boolean(self.__eq__(value)))
-    
-    def __gt__(self, value):
-        if not isinstance(value, Token):
-            return translate_boolean(False), None
-        
-        if self.type not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if value.type not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if self.type == "BOOLEAN":
-            a = translate_boolean(self)
-        else:
-            a = self.value
-        
-        if value.type == "BOOLEAN":
-            b = translate_boolean(value)
-        else:
-            b = value.value
-
-        return translate_boolean(float(a) > float(b)), None
-    
-    def __ge__(self, value):
-        res, error = self.__gt__(value)
-        if error:
-            return None, error
-        
-        return translate_boolean(translate_boolean(res) or translate_boolean(self.__eq__(value))), None
-    
-    def __lt__(self, value):
-        if not isinstance(value, Token):
-            return translate_boolean(False), None
-        
-        if self.type not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if value.type not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if self.type == "BOOLEAN":
-            a = translate_boolean(self)
-        else:
-            a = self.value
-
-        if value.type == "BOOLEAN":
-            b = translate_boolean(value)
-        else:
-            b = value.value
-
-        return translate_boolean(float(a) < float(b)), None
-    
-    def __le__(self, value):
-        res, error = self.__lt__(value)
-        if error:
-            return None, error
-        
-        return translate_boolean(translate_boolean(res) or translate_boolean(self.__eq__(value))), None
-
-    def __add__(self, value):
-        if self.type not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if value.type not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {value.type.lower()}")
-        
-        res = float(self.value) + float(value.value)
-        return Token("NUMBER", int(res) if res % 1 == 0 else res), None
-    
-    def __sub__(self, value):
-        if self.type not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if value.type not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {value.type.lower()}")
-        
-        res = float(self.value) - float(value.value)
-        return Token("NUMBER", int(res) if res % 1 == 0 else res), None
-    
-    def __mul__(self, value):
-        if self not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if value not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {value.type.lower()}")
-        
-        res = float(self.value) * float(value.value)
-        return Token("NUMBER", int(res) if res % 1 == 0 else res), None
-    
-    def __truediv__(self, value):
-        if self not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if value not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {value.type.lower()}")
-        
-        if check(value, Token("NUMBER", 0)):
-            return None, Error("MathError", f"Cannot divide {self.value} to 0")
-        
-        res = float(self.value) / float(value.value)
-        return Token("NUMBER", int(res) if res % 1 == 0 else res), None
-    
-    def __pow__(self, value):
-        if self not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        if value not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {value.type.lower()}")
-        
-        res = float(self.value) ** float(value.value)
-        return Token("NUMBER", int(res) if res % 1 == 0 else res), None
-    
-    def __neg__(self):
-        if self not in ["NUMBER", "BOOLEAN"]:
-            return None, Error("TypeError", f"Expected number, got {self.type.lower()}")
-        
-        return Token("NUMBER", -self.value)
-
-    def __repr__(self):
-        return f"(TOKEN {self.type}: {self.value})" if self.value else f"(TOKEN {self.type})"
-
-class Variable:
-    def __init__(self, name, value, immutable):
-        self.name = name
-        self.value = value
-        self.immutable = immutable
-    
-    def __repr__(self):
-        return f"(VARIABLE {self.name}: {self.value.__repr__()}) (immutable = {str(self.immutable).upper()})"
-
-class SymbolTable:
-    def __init__(self):
-        self.table = {}
-
-    def update(self, var_object):
-        if var_object.name in self.table:
-            if self.table[var_object.name].immutable:
-                return None, Error("VariableError", f"Variable '{var_object.name}' cannot be changed")
-        
-        self.table.update({var_object.name: var_object})
-        return var_object.value, None
-    
-    def get(self, name):
-        if name not in self.table:
-            return None, Error("VariableError", f"Variable '{name}' is not defined")
-        
-        return self.table[name].value, None
-    
-    def __repr__(self):
-        current = "(SYMBOL TABLE: "
-        for key in self.table:
-            current += f"({key}: {self.table[key].value.__repr__()}), "
-
-        current = current[0:len(current)-2]
-        current += ")"
-        return current
-
-symbol_table = SymbolTable()
-
-# Lexer
-class Lexer:
-    def __init__(self, text):
-        self.text = text
-        self.index = -1
-        self.current_char = None
-        self.advance()
-    
-    def advance(self):
-        self.index += 1
-        self.current_char = None if self.index >= len(self.text) else self.text[self.index]
-    
-    def make_tokens(self):
-        tokens = []
-        while self.current_char:
-            match self.current_char:
-                case "+":
-                    element = get_last(tokens)
-                    if element:
-                        if element.type in ["PLUS", "MINUS"]:
-                            self.advance()
-                            continue
-                    
-                    tokens += [Token("PLUS")]
-                    self.advance()
-                case "-":
-                    element = get_last(tokens)
-                    if element:
-                        if element.type in ["PLUS", "MINUS"]:
-                            tokens[-1] = Token("PLUS") if check(element, Token("MINUS")) else Token("MINUS")
-                            self.advance()
-                            continue
-
-                    tokens += [Token("MINUS")]
-                    self.advance()
-                case "*":
-                    tokens += [Token("MUL")]
-                    self.advance()
-                case "/":
-                    tokens += [Token("DIV")]
-                    self.advance()
-                case "^":
-                    tokens += [Token("POW")]
-                    self.advance()
-                case "=":
-                    res, error = self.make_ee()
-                    if error:
-                        return None, error
-                    
-                    tokens += [res]
-                    self.advance()
-                case "!":
-                    res, error = self.make_ne()
-                    if error:
-                        return None, error
-                    
-                    tokens += [res]
-                    self.advance()
-                case ">":
-                    res, error = self.make_greater_or_equal()
-                    if error:
-                        return None, error
-                    
-                    tokens += [res]
-                    self.advance()
-                case "<":
-                    res, error = self.make_smaller_or_equal()
-                    if error:
-                        return None, error
-                    
-                    tokens += [res]
-                    self.advance()
-                case "(":
-                    tokens += [Token("LPAREN")]
-                    self.advance()
-                case ")":
-                    tokens += [Token("RPAREN")]
-                    self.advance()
-                case ":":
-                    tokens += [Token("COLON")]
-                    self.advance()
-                case _:
-                    if self.current_char in " \n\t":
-                        self.advance()
-                        continue
-
-                    if self.current_char in LETTERS + ["_"]:
-                        token, error = self.make_identifier_or_keyword()
-                        if error:
-                            return [], error
-                        
-                        tokens += [token]
-                    elif self.current_char in DIGITS + ["."]:
-                        token, error = self.make_numbers()
-                        if error:
-                            return [], error
-
-                        tokens += [token]
-                    else:
-                        return [], Error("SyntaxError", f"Unexpected character: '{self.current_char}'")
-        
-        return tokens, None
-    
-    def make_numbers(self):
-        number = ""
-        while self.current_char in DIGITS + ["."]:
-            number += self.current_char
-            self.advance()
-        
-        if "." not in number:
-            return Token("NUMBER", int(number)), None
-        
-        if number.count(".") > 1:
-            return None, Error("SyntaxError", f"Expect only one '.' in a number, got {number.count(".")}/1")
-        
-        return Token("NUMBER", float(number)), None
-    
-    def make_identifier_or_keyword(self):
-        global LETTERS, DIGITS
-        identifier = ""
-        while self.current_char in LETTERS + DIGITS + ["_"]:
-            identifier += self.current_char
-            self.advance()
-        
-        if identifier in KEYWORDS:
-            return Token("KEYWORD", identifier), None
-        
-        if identifier in ["true", "false"]:
-            return Token("BOOLEAN", identifier), None
-        
-        if identifier == "null":
-            return Token("NULL", "null"), None
-        
-        return Token("IDENTIFIER", identifier), None
-    
-    def make_ee(self):
-        self.advance()
-        if self.current_char != "=":
-            if self.current_char:
-                return None, Error("SyntaxError", f"Expected '=', not '{self.current_char}'")
-            
-            return None, Error("SyntaxError", "Expected '='")
-        
-        return Token("EE"), None
-
-    def make_ne(self):
-        self.advance()
-        if self.current_char != "=":
-            if self.current_char:
-                return None, Error("SyntaxError", f"Expected '=', not '{self.current_char}'")
-            
-            return None, Error("SyntaxError", "Expected '='")
-        
-        return Token("NE"), None
-    
-    def make_greater_or_equal(self):
-        self.advance()
-        if self.current_char == "=":
-            return Token("GE"), None
-        
-        return Token("GT"), None
-    
-    def make_smaller_or_equal(self):
-        self.advance()
-        if self.current_char == "=":
-            return Token("SE"), None
-        
-        return Token("ST"), None
-
-# Parser
-class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.index = -1
-        self.current_token = None
-        self.advance()
-    
-    def advance(self):
-        self.index += 1
-        self.current_token = self.tokens[self.index] if 0 <= self.index < len(self.tokens) else None
-    
-    def move_back(self):
-        self.index -= 1
-        self.current_token = self.tokens[self.index] if 0 <= self.index < len(self.tokens) else None
-    
-    def generate_syntax_branch(self):
-        if not self.tokens:
-            return None, None, Error("SyntaxError", "No value to parse")
-
-        if (self.current_token.type, self.current_token.value) in [("KEYWORD", "variable"), ("KEYWORD", "let")]:
-            res, error = self.variable_declaration()
-            if error:
-                return "var", None, error
-            
-            return "var", res, None
-
-        if check(self.current_token, Token("KEYWORD", "constant")):
-            res, error = self.const_variable_declaration()
-            if error:
-                return "const", None, error
-            
-            return "const", res, None
-        
-        if check(self.current_token, Token("KEYWORD", "else")):
-            self.advance()
-            if check(self.current_token, Token("KEYWORD", "if")):
-                return None, None, Error("else if has no parent if")
-            
-            return None, None, Error("else has no parent if")
-        
-        if check(self.current_token, Token("KEYWORD", "if")):
-            res, error = self.if_statement()
-            if error:
-                return "if", None, error
-            
-            return "if", res, None
-
-        if check(self.current_token, Token("IDENTIFIER")):
-            self.advance()
-            if check(self.current_token, Token("KEYWORD")):
-                res, error = self.update_variable()
-                if error:
-                    return "var_update", None, error
-                
-                return "var_update", res, None
-
-            self.move_back()
-
-        res, error = self.turn_to_postfix()
-        if error:
-            return "postfix", None, error
-        
-        return "postfix", res, None
-
-    def turn_to_postfix(self):
-        postfix = []
-        operators = []
-        precedence = {
-            "LPAREN": 0,
-            "OR": 1,
-            "AND": 2,
-            "NOT": 3,
-            "EE": 4,
-            "NE": 4,
-            "GT": 4,
-            "GE": 4,
-            "SE": 4,
-            "ST": 4,
-            "PLUS": 5,
-            "MINUS": 5,
-            "MUL": 6,
-            "DIV": 6,
-            "POW": 7
-        }
-
-        while not check(self.current_token, None):
-            if check(self.current_token, Token("KEYWORD", "and")):
-                self.current_token = Token("AND")
-            elif check(self.current_token, Token("KEYWORD", "or")):
-                self.current_token = Token("OR")
-            elif check(self.current_token, Token("KEYWORD", "not")):
-                self.current_token = Token("NOT")
-
-            if self.current_token.type in OFFICIAL_DATA_TYPES or check(self.current_token, Token("IDENTIFIER")):
-                postfix += [self.current_token]
-            elif check(self.current_token, Token("KEYWORD", "if")):
-                stack = []
-                if_tok = []
-                while not check(self.current_token, None):
-                    if check(self.current_token, Token("LPAREN")):
-                        stack += [Token("LPAREN")]
-                    
-                    if check(self.current_token, Token("RPAREN")):
-                        if not stack:
-                            break
-
-                        if not check(stack.pop(), Token("LPAREN")):
-                            return None, Error("SyntaxError", "Unexpected ')'")
-                    
-                    if_tok += [self.current_token]
-                    self.advance()
-                
-                if check(self.current_token, Token("RPAREN")):
-                    if "LPAREN" not in operators:
-                        return None, Error("SyntaxError", "Unexpected ')'")
-
-                    operators = operators[::-1]
-                    operators.remove("LPAREN")
-                    operators = operators[::-1]
-                
-                new_parser = Parser(if_tok)
-                type_, res, error = new_parser.generate_syntax_branch()
-                if error:
-                    return None, error
-                
-                new_interpreter = Interpreter(type_, res)
-                res, error = new_interpreter.run_tokens()
-                if error:
-                    return None, error
-                
-                postfix += [res]
-            elif check(self.current_token, Token("KEYWORD")):
-                return None, Error("SyntaxError", f"'{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}' can't be in expressions")
-            else:
-                match self.current_token.type:
-                    case "LPAREN":
-                        operators += ["LPAREN"]
-                    case "RPAREN":
-                        if "LPAREN" not in operators:
-                            return None, Error("SyntaxError", "Unexpected ')'")
-
-                        while operators[-1] != "LPAREN":
-                            postfix += [Token(operators.pop())]
-                        
-                        operators.pop()
-                    case _:
-                        if not operators:
-                            operators += [self.current_token.type]
-                            self.advance()
-                            continue
-
-                        if self.current_token.type not in precedence:
-                            return None, Error("SyntaxError", f"Unexpected character: '{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}'")
-
-                        if precedence[self.current_token.type] <= precedence[operators[-1]] and precedence[self.current_token.type] != precedence["POW"] and precedence[operators[-1]] != precedence["POW"]:
-                            postfix += [Token(operators.pop())]
-                        
-                        operators += [self.current_token.type]
-            
-            self.advance()
-
-        temp = operators.copy()
-        while operators:
-            match operators.pop():
-                case "LPAREN":
-                    return None, Error("SyntaxError", "Unexpected '('")
-
-        return postfix + list(map(lambda x: Token(x), temp[::-1])), None
-    
-    def variable_declaration(self):
-        keyword = self.current_token
-        self.advance()
-        if not self.current_token:
-            return None, Error("SyntaxError", "Expected identifier")
-        
-        if not check(self.current_token, Token("IDENTIFIER")):
-            return None, Error("SyntaxError", f"Expected identifier, got '{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}'")
-        
-        variable_name = self.current_token.value
-        self.advance()
-        if check(keyword, Token("KEYWORD", "variable")):
-            if not self.current_token:
-                return None, Error("SyntaxError", "Expected 'is'")
-            
-            if not check(self.current_token, Token("KEYWORD", "is")):
-                return None, Error("SyntaxError", f"Expected 'is', got '{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}'")
-        elif not self.current_token:
-            return None, Error("SyntaxError", "Expected 'be'")
-        elif not check(self.current_token, Token("KEYWORD", "be")):
-            return None, Error("TypeError", f"Expected 'be', got '{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}'")
-        
-        self.advance()
-        new_tokens = self.tokens[self.index:]
-        new_parser = Parser(new_tokens)
-        type_, value, error = new_parser.generate_syntax_branch()
-        if error:
-            return None, error
-        
-        new_interpreter = Interpreter(type_, value)
-        value, error = new_interpreter.run_tokens()
-        if error:
-            return None, error
-        
-        if variable_name in symbol_table.table:
-            return None, Error("SyntaxError", f"There is already a declaration with the name '{variable_name}'")
-
-        return Variable(variable_name, value, False), None
-    
-    def const_variable_declaration(self):
-        self.advance()
-        if not self.current_token:
-            return None, Error("SyntaxError", "Expected identifier")
-        
-        if not check(self.current_token, Token("IDENTIFIER")):
-            return None, Error("SyntaxError", f"Expected identifier, got '{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}'")
-        
-        variable_name = self.current_token.value
-        self.advance()
-        if not self.current_token:
-            return None, Error("Expected 'is'")
-        
-        if not check(self.current_token, Token("KEYWORD", "is")):
-            return None, Error("SyntaxError", f"Expected 'is', got '{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}'")
-        
-        self.advance()
-        new_tokens = self.tokens[self.index:]
-        new_parser = Parser(new_tokens)
-        type_, value, error = new_parser.generate_syntax_branch()
-        if error:
-            return None, error
-        
-        new_interpreter = Interpreter(type_, value)
-        value, error = new_interpreter.run_tokens()
-        if error:
-            return None, error
-        
-        return Variable(variable_name, value, True), None
-    
-    def update_variable(self):
-        self.move_back()
-        variable_name = self.current_token.value
-
-        self.advance()
-        if not check(self.current_token, Token("KEYWORD", "is")):
-            return None, Error("SyntaxError", f"Expected 'is', got '{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}'")
-        
-        self.advance()
-        if not check(self.current_token, Token("KEYWORD", "now")):
-            return None, Error("SyntaxError", f"Expected 'now', got '{NONE_VALUES_DICT.get(self.current_token.type, self.current_token.value)}'")
-        
-        self.advance()
-        new_tokens = self.tokens[self.index:]
-        new_parser = Parser(new_tokens)
-
-        type_, value, error = new_parser.generate_syntax_branch()
-        if error:
-            return None, error
-        
-        new_interpreter = Interpreter(type_, value)
-        value, error = new_interpreter.run_tokens()
-        if error:
-            return None, error
-
-        if variable_name not in symbol_table.table:
-            return None, Error("SyntaxError", f"There are not any variable declaration with the name '{variable_name}'")
-
-        return Variable(variable_name, value, False), None
-    
-    def if_statement(self, original=[]):
-        self.advance()
-        
-        # check for condition
-        condition_tok = []
-        stack = []
-        while (not check(self.current_token, Token("COLON")) or stack) and not check(self.current_token, None):
-            if check(self.current_token, Token("LPAREN")):
-                stack += ["LPAREN"]
-            elif check(self.current_token, Token("RPAREN")):
-                if not stack:
-                    return None, Error("SyntaxError", "Unexpected ')'")
-                
-                if stack.pop() != "LPAREN":
-                    return None, Error("SyntaxError", "Unexpected ')'")
-                
-            condition_tok += [self.current_token]
-            self.advance()
-        
-        if not condition_tok:
-            return None, Error("SyntaxError", "Expected condition")
-
-        if not self.current_token:
-            return None, Error("SyntaxError", "Expected ':'")
-
-        new_parser = Parser(condition_tok)
-        ctype, condition, error = new_parser.generate_syntax_branch()
-        if error:
-            return None, error
-
-        # check for value
-        self.advance()
-        value_tok = []
-        stack = []
-        while (not check(self.current_token, Token("KEYWORD", "else")) or stack) and not check(self.current_token, None):
-            if check(self.current_token, Token("LPAREN")):
-                stack += ["LPAREN"]
-            elif check(self.current_token, Token("RPAREN")):
-                if not stack:
-                    return None, Error("SyntaxError", "Unexpected ')'")
-                
-                if stack.pop() != "LPAREN":
-                    return None, Error("SyntaxError", "Unexpected ')'")
-                
-            value_tok += [self.current_token]
-            self.advance()
-        
-        if not value_tok:
-            return None, Error("SyntaxError", "Expected value")
-        
-        new_parser = Parser(value_tok)
-        vtype, value, error = new_parser.generate_syntax_branch()
-        if error:
-            return None, error
-
-        if not self.current_token:
-            return original + [[(ctype, condition), (vtype, value)]], None
-        
-        self.advance()
-        if check(self.current_token, None):
-            return None, Error("SyntaxError", "Expected 'if' or ':'")
-        
-        if not check(self.current_token, Token("KEYWORD", "if")) and not check(self.current_token, Token("COLON")):
-            return None, Error("SyntaxError", f"Expected 'if' or ':', not '{NONE_VALUES_DICT.get(self.current_token, self.current_token.value)}'")
-        
-        if check(self.current_token, Token("KEYWORD", "if")):
-            res, error = self.if_statement(original + [[(ctype, condition), (vtype, value)]])
-            if error:
-                return None, error
-            
-            return res, None
-        
-        self.advance()
-        value_tok = self.tokens[self.index:]
-        if not value_tok:
-            return None, Error("SyntaxError", "Expected value")
-        
-        new_parser = Parser(value_tok)
-        type_, res, error = new_parser.generate_syntax_branch()
-        if error:
-            return None, error
-        
-        return original + [[(ctype, condition), (vtype, value)]] + [(type_, res)], None
-
-# Interpreter
-class Interpreter:
-    def __init__(self, type_, res):
-        self.type = type_
-        self.res = res
-    
-    def run_tokens(self):
-        match self.type:
-            case "var":
-                res, error = self.run_variable_declaration()
-                if error:
-                    return None, error
-                
-                return res, None
-            case "const":
-                res, error = self.run_variable_declaration()
-                if error:
-                    return None, error
-                
-                return res, None
-            case "var_update":
-                res, error = self.run_variable_declaration()
-                if error:
-                    return None, error
-                
-                return res, None
-            case "if":
-                res, error = self.run_if()
-                if error:
-                    return None, error
-                
-                return res, None
-            case "postfix":
-                res, error = self.run_postfix()
-                if error:
-                    return None, error
-                
-                return res, None
-
-    def run_postfix(self):
-        stack = []
-        for token in self.res:
-            if token.type in OFFICIAL_DATA_TYPES:
-                stack += [token]
-            elif check(token, Token("IDENTIFIER")):
-                res, error = symbol_table.get(token.value)
-                if error:
-                    return None, error
-                
-                stack += [res]
-            else:
-                match token.type:
-                    case "PLUS":
-                        if not stack:
-                            return None, Error("SyntaxError", "Too less numbers to perform addition, got 0/2")
-                        
-                        if len(stack) == 1:
-                            continue
-
-                        res, error = stack.pop() + stack.pop()
-                        if error:
-                            return None, error
-                        
-                        stack += [res]
-                    case "MINUS":
-                        if not stack:
-                            return None, Error("SyntaxError", "Too few numbers to perform subtraction, got 0/2")
-                        
-                        if len(stack) == 1:
-                            res, error = Token("NUMBER", 0) - stack.pop()
-                            if error:
-                                return None, error
-                            
-                            stack += [res]
-                            continue
-
-                        res, error = -stack.pop() + stack.pop()
-                        if error:
-                            return None, error
-                        
-                        stack += [res]
-                    case "MUL":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform subtraction, got {operands}/2")
-                        
-                        res, error = stack.pop() * stack.pop()
-                        if error:
-                            return None, error
-                        
-                        stack += [res]
-                    case "DIV":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform division, got {operands}/2")
-                        
-                        b = stack.pop()
-                        a = stack.pop()
-                        res, error = a / b
-                        if error:
-                            return None, error
-
-                        stack += [res]
-                    case "POW":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform exponentation, got {operands}/2")
-                        
-                        b = stack.pop()
-                        a = stack.pop()
-                        res, error = a ** b
-                        if error:
-                            return None, error
-                        
-                        stack += [res]
-                    case "EE":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform equality, got {operands}/2")
-                        
-                        stack += [stack.pop() == stack.pop()]
-                    case "NE":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform inequality, got {operands}/2")
-                        
-                        stack += [stack.pop() != stack.pop()]
-                    case "GT":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform greater than, got {operands}/2")
-                        
-                        res, error = stack.pop() < stack.pop()
-                        if error:
-                            return None, error
-                        
-                        stack += [res]
-                    case "GE":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform greater than, got {operands}/2")
-                        
-                        res, error = stack.pop() <= stack.pop()
-                        if error:
-                            return None, error
-                        
-                        stack += [res]
-                    case "ST":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform greater than, got {operands}/2")
-                        
-                        res, error = stack.pop() > stack.pop()
-                        if error:
-                            return None, error
-                        
-                        stack += [res]
-                    case "SE":
-                        operands = len(stack)
-                        if operands < 2:
-                            return None, Error("SyntaxError", f"Too few numbers to perform greater than, got {operands}/2")
-                        
-                        res, error = stack.pop() >= stack.pop()
-                        if error:
-                            return None, error
-                        
-                        stack += [res]
-
-        return stack[0], None
-    
-    def run_variable_declaration(self):
-        res, error = symbol_table.update(self.res)
-        if error:
-            return None, error
-
-        return res, None
-    
-    def run_if(self):
-        for pair in self.res:
-            if isinstance(pair, list):
-                condition_branch = pair[0]
-                value_branch = pair[1]
-                
-                new_interpreter = Interpreter(condition_branch[0], condition_branch[1])
-                condition, error = new_interpreter.run_tokens()
-                if error:
-                    return None, error
-
-                new_interpreter = Interpreter(value_branch[0], value_branch[1])
-                value, error = new_interpreter.run_tokens()
-                if error:
-                    return None, error
-                
-                if translate_boolean(condition):
-                    return value, None
-
-                continue
-
-            new_interpreter = Interpreter(pair[0], pair[1])
-            value, error = new_interpreter.run_tokens()
-            if error:
-                return None, error
-            
-            return value, None
-        
-        return None, None
-
-def get_last(array):
-    if array:
-        return array[-1]
-    
-    return None
-
-def translate_boolean(value):
-    match value:
-        case True:
-            return Token("BOOLEAN", "true")
-        case False:
-            return Token("BOOLEAN", "false")
-        case _:
-            if (value == Token("BOOLEAN", "true")).value == "true":
-                return True
-            
-            if (value == Token("BOOLEAN", "false")).value == "true":
-                return False
-        
-            if value == Token("NUMBER"):
-                return value.value != 0
-            
-            if value == Token("NULL"):
-                return False
-
-def check(a, b):
-    if isinstance(a, Token) or isinstance(b, Token):
-        return translate_boolean(a == b)
-    
-    return a == b
-
-def run(snippet):
-    lexer = Lexer(snippet)
-    tokens, error = lexer.make_tokens()
-    if error:
-        print(error.as_string())
-        return
-
-    parser = Parser(tokens)
-    type_, res, error = parser.generate_syntax_branch()
-    if error:
-        print(error.as_string())
-        return
-
-    interpreter = Interpreter(type_, res)
-    res, error = interpreter.run_tokens()
-    if error:
-        print(error.as_string())
-        return
-
-    if res:
-        print(res.value)
-
-file = input("Which file do you want to run? ")
-with open(f"{file}.normal") as file:
-    lines = file.read().split("\n")
-
-line = 0
-while line < len(lines):
-    if lines[line].strip():
-        run(lines[line])
-
-    line += 1
+import re
+from collections import OrderedDict
+from itertools import count
+from array import array
+from decimal import Context, Decimal, InvalidOperation
+from threading import Lock, RLock
+
+KEYWORDS = frozenset([
+    "variable",
+    "is",
+    "let",
+    "now",
+    "be",
+    "constant",
+    "and",
+    "or",
+    "not",
+    "if",
+    "else"
+])
+
+# Token types
+(
+    TT_NUMBER,
+    TT_BOOLEAN,
+    TT_NULL,
+    TT_IDENTIFIER,
+    TT_KEYWORD,
+    TT_PLUS,
+    TT_MINUS,
+    TT_MUL,
+    TT_DIV,
+    TT_POW,
+    TT_LPAREN,
+    TT_RPAREN,
+    TT_COLON,
+    TT_EE,
+    TT_NE,
+    TT_GT,
+    TT_GE,
+    TT_ST,
+    TT_SE,
+    TT_AND,
+    TT_OR,
+    TT_NOT
+) = range(22)
+
+TYPE_NAMES = [
+    "NUMBER",
+    "BOOLEAN",
+    "NULL",
+    "IDENTIFIER",
+    "KEYWORD",
+    "PLUS",
+    "MINUS",
+    "MUL",
+    "DIV",
+    "POW",
+    "LPAREN",
+    "RPAREN",
+    "COLON",
+    "EE",
+    "NE",
+    "GT",
+    "GE",
+    "ST",
+    "SE",
+    "AND",
+    "OR",
+    "NOT"
+]
+
+OFFICIAL_DATA_TYPES = frozenset([TT_NUMBER, TT_BOOLEAN, TT_NULL])
+
+NONE_VALUES_DICT = {
+    TT_PLUS: "+",
+    TT_MINUS: "-",
+    TT_MUL: "*",
+    TT_DIV: "/",
+    TT_POW: "^",
+    TT_LPAREN: "(",
+    TT_RPAREN: ")",
+    TT_EE: "==",
+    TT_NE: "!=",
+    TT_GT: ">",
+    TT_GE: ">=",
+    TT_ST: "<",
+    TT_SE: "<=",
+    TT_COLON: ":",
+    TT_AND: "and",
+    TT_OR: "or",
+    TT_NOT: "not"
+}
+
+# Errors
+# Errors are raised where they happen and caught once per statement, so the
+# success path never builds or checks a result pair. A span is the (start,
+# end) character range in the statement's source line that the error points
+# at; the innermost part of the program that knows its position sets it.
+class Error(Exception):
+    error = "Error"
+
+    def __init__(self, reason, span=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.span = span
+    
+    def at(self, span):
+        if self.span is None:
+            self.span = span
+        
+        return self
+    
+    def as_string(self):
+        return f"{self.error}: {self.reason}"
+
+    def __repr__(self):
+        return f"(ERROR {self.error}: {self.reason})"
+
+# The printed kind comes from the error attribute; the two kinds that share
+# a name with Python's own exceptions get a prefix so they never shadow them
+class NormalSyntaxError(Error):
+    error = "SyntaxError"
+
+class NormalTypeError(Error):
+    error = "TypeError"
+
+class MathError(Error):
+    error = "MathError"
+
+class VariableError(Error):
+    error = "VariableError"
+
+# Basic components
+class Token:
+    __slots__ = ("type", "value")
+
+    def __init__(self, type, value=None):
+        self.type = type
+        self.value = value
+
+    def __repr__(self):
+        return f"(TOKEN {TYPE_NAMES[self.type]}: {self.value})" if self.value else f"(TOKEN {TYPE_NAMES[self.type]})"
+
+TRUE_TOKEN = Token(TT_BOOLEAN, "true")
+FALSE_TOKEN = Token(TT_BOOLEAN, "false")
+NULL_TOKEN = Token(TT_NULL, "null")
+
+# Operator and keyword tokens carry no per-occurrence data, so a single
+# instance of each is shared and matched by identity.
+TYPE_TOKENS = [Token(type_) for type_ in range(len(TYPE_NAMES))]
+KEYWORD_TOKENS = {keyword: Token(TT_KEYWORD, keyword) for keyword in KEYWORDS}
+
+KW_VARIABLE = KEYWORD_TOKENS["variable"]
+KW_IS = KEYWORD_TOKENS["is"]
+KW_LET = KEYWORD_TOKENS["let"]
+KW_NOW = KEYWORD_TOKENS["now"]
+KW_BE = KEYWORD_TOKENS["be"]
+KW_CONSTANT = KEYWORD_TOKENS["constant"]
+KW_AND = KEYWORD_TOKENS["and"]
+KW_OR = KEYWORD_TOKENS["or"]
+KW_NOT = KEYWORD_TOKENS["not"]
+KW_IF = KEYWORD_TOKENS["if"]
+KW_ELSE = KEYWORD_TOKENS["else"]
+
+# Values
+# Runtime values are plain Python objects: int/float for numbers, True/False
+# for booleans and None for null.
+def type_name(value):
+    if value is None:
+        return "null"
+    
+    if value is True or value is False:
+        return "boolean"
+    
+    return "number"
+
+def to_text(value):
+    if value is True:
+        return "true"
+    
+    if value is False:
+        return "false"
+    
+    if value is None:
+        return "null"
+    
+    try:
+        return str(value)
+    except ValueError:
+        # Integers past Python's digit limit for str() are shown in
+        # scientific notation instead
+        return int_to_scientific(value)
+
+TEXT_CONTEXT = Context(prec=40)
+LOG10_2 = TEXT_CONTEXT.log10(Decimal(2))
+
+def int_to_scientific(value):
+    # Decimal(value) converts in superlinear time, so the digits come from
+    # the top 128 bits alone: log10(value) = log10(top) + shift * log10(2),
+    # worked out to 40 digits, so the 16 digits shown only differ from the
+    # exact value on an exact tie
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    shift = max(value.bit_length() - 128, 0)
+    logarithm = TEXT_CONTEXT.add(TEXT_CONTEXT.log10(Decimal(value >> shift)), TEXT_CONTEXT.multiply(Decimal(shift), LOG10_2))
+    exponent = int(logarithm)
+    mantissa, carry = format(TEXT_CONTEXT.power(Decimal(10), logarithm - exponent), ".15e").split("e")
+    return f"{sign}{mantissa}e+{exponent + int(carry)}"
+
+def token_value(token):
+    if token.type == TT_NUMBER:
+        return token.value
+    
+    if token.type == TT_BOOLEAN:
+        return token is TRUE_TOKEN
+    
+    return None
+
+def number_error(a, b):
+    return NormalTypeError(f"Expected number, got {type_name(a if a is None else b)}")
+
+def equals(a, b):
+    if a is None or b is None:
+        return a is b
+    
+    if (a is True or a is False) != (b is True or b is False):
+        return False
+    
+    return a == b
+
+# Numbers
+# Two ints always give an exact int. A float only appears once a float is
+# involved or a division does not come out even, and integral floats fold
+# back to ints so 2.5 * 2 is 5 either way. In decimal mode the inexact
+# results are Decimals instead of floats.
+# Ints never grow past this many bits: building bigger ones (and printing
+# them) takes long enough to hang a run
+MAX_INT_BITS = 1 << 20
+DECIMAL_CONTEXT = Context(prec=28)
+DECIMAL_MODE = False
+# Past the int-int fast path, any of these pairs means float arithmetic
+FLOAT_OPERANDS = frozenset([int, float])
+
+def normalize(res):
+    if type(res) is Decimal:
+        # Decimal's % fails once the value outgrows the context precision
+        return int(res) if res.is_finite() and res == res.to_integral_value() else res
+    
+    return int(res) if res % 1 == 0 else res
+
+def coerce(a, b):
+    if type(a) is bool:
+        a = int(a)
+    
+    if type(b) is bool:
+        b = int(b)
+    
+    if type(a) is Decimal or type(b) is Decimal:
+        return to_decimal(a), to_decimal(b)
+    
+    if type(a) is float or type(b) is float:
+        return float(a), float(b)
+    
+    return a, b
+
+def to_decimal(value):
+    if type(value) is float:
+        return Decimal(repr(value))
+    
+    return Decimal(value)
+
+def too_large_error(a, operator, b):
+    return MathError(f"Result of {to_text(a)} {operator} {to_text(b)} is too large")
+
+def not_real_error(a, b):
+    return MathError(f"{to_text(a)} ^ {to_text(b)} is not a real number")
+
+def inexact(a, b, operation, decimal_operation, operator):
+    try:
+        a, b = coerce(a, b)
+        if type(a) is int:
+            return operation(a, b)
+        
+        if type(a) is Decimal:
+            return normalize(decimal_operation(a, b))
+        
+        return normalize(operation(a, b))
+    except ArithmeticError:
+        raise too_large_error(a, operator, b)
+
+def float_add(a, b):
+    return a + b
+
+def float_subtract(a, b):
+    return a - b
+
+def float_multiply(a, b):
+    return a * b
+
+def add(a, b):
+    if type(a) is int and type(b) is int:
+        return a + b
+    
+    if type(a) in FLOAT_OPERANDS and type(b) in FLOAT_OPERANDS:
+        try:
+            res = float(a) + float(b)
+        except OverflowError:
+            raise too_large_error(a, "+", b)
+        
+        return int(res) if res % 1 == 0 else res
+    
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    return inexact(a, b, float_add, DECIMAL_CONTEXT.add, "+")
+
+def subtract(a, b):
+    if type(a) is int and type(b) is int:
+        return a - b
+    
+    if type(a) in FLOAT_OPERANDS and type(b) in FLOAT_OPERANDS:
+        try:
+            res = float(a) - float(b)
+        except OverflowError:
+            raise too_large_error(a, "-", b)
+        
+        return int(res) if res % 1 == 0 else res
+    
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    return inexact(a, b, float_subtract, DECIMAL_CONTEXT.subtract, "-")
+
+def multiply_ints(a, b):
+    # The product has at most bits(a) + bits(b) bits
+    if a.bit_length() + b.bit_length() > MAX_INT_BITS:
+        raise too_large_error(a, "*", b)
+    
+    return a * b
+
+def multiply(a, b):
+    if type(a) is int and type(b) is int:
+        return multiply_ints(a, b)
+    
+    if type(a) in FLOAT_OPERANDS and type(b) in FLOAT_OPERANDS:
+        try:
+            res = float(a) * float(b)
+        except OverflowError:
+            raise too_large_error(a, "*", b)
+        
+        return int(res) if res % 1 == 0 else res
+    
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    return inexact(a, b, float_multiply, DECIMAL_CONTEXT.multiply, "*")
+
+def divide(a, b):
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    if b == 0:
+        raise MathError(f"Cannot divide {to_text(a)} to 0")
+    
+    if type(a) in FLOAT_OPERANDS and type(b) in FLOAT_OPERANDS and (type(a) is float or type(b) is float):
+        try:
+            res = float(a) / float(b)
+        except OverflowError:
+            raise too_large_error(a, "/", b)
+        
+        return int(res) if res % 1 == 0 else res
+    
+    a, b = coerce(a, b)
+    if type(a) is int:
+        if a % b == 0:
+            return a // b
+        
+        if DECIMAL_MODE:
+            a, b = Decimal(a), Decimal(b)
+    
+    try:
+        if type(a) is Decimal:
+            return normalize(DECIMAL_CONTEXT.divide(a, b))
+        
+        return normalize(a / b)
+    except ArithmeticError:
+        raise too_large_error(a, "/", b)
+
+def power(a, b):
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    base, exponent = coerce(a, b)
+    if exponent == 0:
+        return 1
+    
+    if base == 0 and exponent < 0:
+        raise MathError("Cannot raise 0 to a negative power")
+    
+    # A whole base to a positive whole power is computed exactly, however
+    # the operands were written
+    if exponent > 0 and exponent % 1 == 0 and base % 1 == 0:
+        base, exponent = int(base), int(exponent)
+        # The result has at least exponent * (bits(base) - 1) + 1 bits, exactly
+        # that many for a power of two; refuse before spending the time and
+        # memory to build it
+        if base not in (-1, 0, 1) and exponent * (base.bit_length() - 1) + 1 > MAX_INT_BITS:
+            raise too_large_error(a, "^", b)
+        
+        return base ** exponent
+    
+    if type(base) is int:
+        base, exponent = (Decimal(base), Decimal(exponent)) if DECIMAL_MODE else (float(base), float(exponent))
+    
+    try:
+        if type(base) is Decimal:
+            res = DECIMAL_CONTEXT.power(base, exponent)
+        else:
+            res = base ** exponent
+    except InvalidOperation:
+        raise not_real_error(a, b)
+    except ArithmeticError:
+        raise too_large_error(a, "^", b)
+    
+    # A negative float raised to a fractional power comes back complex
+    if type(res) is complex:
+        raise not_real_error(a, b)
+    
+    return normalize(res)
+
+def negate(a):
+    return subtract(0, a)
+
+def to_number(a):
+    if a is None:
+        raise number_error(a, a)
+    
+    if type(a) is bool:
+        return int(a)
+    
+    if type(a) is int:
+        return a
+    
+    return normalize(a)
+
+def logical_not(a):
+    return not a
+
+def equal(a, b):
+    return equals(a, b)
+
+def not_equal(a, b):
+    return not equals(a, b)
+
+def greater(a, b):
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    return a > b
+
+def greater_equal(a, b):
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    return a > b or equals(a, b)
+
+def smaller(a, b):
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    return a < b
+
+def smaller_equal(a, b):
+    if a is None or b is None:
+        raise number_error(a, b)
+    
+    return a < b or equals(a, b)
+
+UNARY_OPERATIONS = {
+    TT_PLUS: to_number,
+    TT_MINUS: negate,
+    TT_NOT: logical_not
+}
+
+BINARY_OPERATIONS = {
+    TT_MUL: (multiply, "multiplication"),
+    TT_DIV: (divide, "division"),
+    TT_POW: (power, "exponentation"),
+    TT_EE: (equal, "equality"),
+    TT_NE: (not_equal, "inequality"),
+    TT_GT: (greater, "greater than"),
+    TT_GE: (greater_equal, "greater than or equal"),
+    TT_ST: (smaller, "smaller than"),
+    TT_SE: (smaller_equal, "smaller than or equal")
+}
+
+# Slots
+# Each table numbers the names used with it, and each compiled program numbers
+# the names it uses. Running a program binds its numbers to the table's (see
+# SymbolTable.bind), so a table only grows with its own names and a compiled
+# program stays valid for any table.
+UNDEFINED = object()
+TABLE_SERIALS = count()
+
+def undefined_error(name):
+    return VariableError(f"Variable '{name}' is not defined")
+
+def constant_error(name):
+    return VariableError(f"Variable '{name}' cannot be changed")
+
+def redeclared_error(name):
+    return NormalSyntaxError(f"There is already a declaration with the name '{name}'")
+
+def undeclared_error(name):
+    return NormalSyntaxError(f"There are not any variable declaration with the name '{name}'")
+
+class SymbolTable:
+    # Snapshots are positions in an undo journal of (slot, old value, old
+    # flag) entries, so taking one is O(1) and rolling back costs one step per
+    # store made since. Snapshots nest like a stack: restoring one discards
+    # every snapshot taken after it. The journal only exists once someone has
+    # asked for a snapshot, or for the length of one statement (see
+    # run_statement).
+    def __init__(self):
+        self.slots = {}
+        self.names = []
+        self.values = []
+        self.immutable = bytearray()
+        self.journal = None
+        self.serial = next(TABLE_SERIALS)
+    
+    def slot(self, name):
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = len(self.names)
+            self.names.append(name)
+            self.values.append(UNDEFINED)
+            self.immutable.append(0)
+            self.slots[name] = slot
+        
+        return slot
+    
+    def bind(self, program):
+        # The table slot of each of the program's names. A table never moves a
+        # name to another slot, so a program keeps the slots of the last table
+        # it ran against in program.binding and only binds again when it runs
+        # against another one.
+        slots = [self.slot(name) for name in program.names]
+        program.binding = (self.serial, slots)
+        return slots
+    
+    def load(self, slot):
+        value = self.values[slot]
+        if value is UNDEFINED:
+            raise undefined_error(self.names[slot])
+        
+        return value
+    
+    def store(self, slot, value, immutable):
+        if self.immutable[slot]:
+            raise constant_error(self.names[slot])
+        
+        journal = self.journal
+        if journal is not None:
+            journal.append((slot, self.values[slot], self.immutable[slot]))
+        
+        self.values[slot] = value
+        self.immutable[slot] = immutable
+        return value
+    
+    def declare_slot(self, slot, value, immutable):
+        if not immutable and self.values[slot] is not UNDEFINED:
+            raise redeclared_error(self.names[slot])
+
+        return self.store(slot, value, immutable)
+    
+    def assign_slot(self, slot, value):
+        if self.values[slot] is UNDEFINED:
+            raise undeclared_error(self.names[slot])
+        
+        return self.store(slot, value, False)
+    
+    def get(self, name):
+        slot = self.slots.get(name)
+        if slot is None:
+            raise undefined_error(name)
+        
+        return self.load(slot)
+    
+    def declare(self, name, value, immutable):
+        return self.declare_slot(self.slot(name), value, immutable)
+    
+    def assign(self, name, value):
+        slot = self.slots.get(name)
+        if slot is None:
+            raise undeclared_error(name)
+        
+        return self.assign_slot(slot, value)
+    
+    def snapshot(self):
+        if self.journal is None:
+            self.journal = []
+        
+        return len(self.journal)
+    
+    def restore(self, snapshot):
+        journal = self.journal
+        values = self.values
+        immutable = self.immutable
+        while len(journal) > snapshot:
+            slot, value, flag = journal.pop()
+            values[slot] = value
+            immutable[slot] = flag
+    
+    def __repr__(self):
+        # Sorted, since the order names get their slots in depends on the engine
+        pairs = [f"({name}: {to_text(value)})" for name, value in sorted(zip(self.names, self.values)) if value is not UNDEFINED]
+        return f"(SYMBOL TABLE: {', '.join(pairs)})"
+
+symbol_table = SymbolTable()
+
+# Lexer
+TOKEN_REGEX = re.compile(r"""
+    (?P<SKIP>[ \n\t]+)
+  | (?P<NUMBER>[0-9.]+)
+  | (?P<NAME>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<OPERATOR>==|!=|>=|<=|[-+*/^()><:])
+  | (?P<EQUALS>[=!])
+  | (?P<UNEXPECTED>.)
+""", re.VERBOSE | re.DOTALL)
+
+OPERATOR_TOKENS = {
+    "+": TYPE_TOKENS[TT_PLUS],
+    "-": TYPE_TOKENS[TT_MINUS],
+    "*": TYPE_TOKENS[TT_MUL],
+    "/": TYPE_TOKENS[TT_DIV],
+    "^": TYPE_TOKENS[TT_POW],
+    "(": TYPE_TOKENS[TT_LPAREN],
+    ")": TYPE_TOKENS[TT_RPAREN],
+    ":": TYPE_TOKENS[TT_COLON],
+    "==": TYPE_TOKENS[TT_EE],
+    "!=": TYPE_TOKENS[TT_NE],
+    ">": TYPE_TOKENS[TT_GT],
+    ">=": TYPE_TOKENS[TT_GE],
+    "<": TYPE_TOKENS[TT_ST],
+    "<=": TYPE_TOKENS[TT_SE]
+}
+
+NAME_TOKENS = {
+    **KEYWORD_TOKENS,
+    "true": TRUE_TOKEN,
+    "false": FALSE_TOKEN,
+    "null": NULL_TOKEN
+}
+
+PLUS_TOKEN = TYPE_TOKENS[TT_PLUS]
+MINUS_TOKEN = TYPE_TOKENS[TT_MINUS]
+
+class Lexer:
+    # Tokens are shared instances, so where each one came from is kept
+    # alongside them: spans[index] is the (start, end) of tokens[index]
+    def __init__(self, text):
+        self.text = text
+        self.spans = []
+    
+    def make_tokens(self):
+        tokens = []
+        append = tokens.append
+        spans = self.spans = []
+        add_span = spans.append
+        last = None
+        for match in TOKEN_REGEX.finditer(self.text):
+            kind = match.lastgroup
+            if kind == "SKIP":
+                continue
+
+            text = match.group()
+            if kind == "OPERATOR":
+                token = OPERATOR_TOKENS[text]
+                if token is PLUS_TOKEN:
+                    if last is PLUS_TOKEN or last is MINUS_TOKEN:
+                        spans[-1] = (spans[-1][0], match.end())
+                        continue
+                elif token is MINUS_TOKEN:
+                    if last is PLUS_TOKEN or last is MINUS_TOKEN:
+                        last = tokens[-1] = MINUS_TOKEN if last is PLUS_TOKEN else PLUS_TOKEN
+                        spans[-1] = (spans[-1][0], match.end())
+                        continue
+            elif kind == "NAME":
+                token = NAME_TOKENS.get(text)
+                if token is None:
+                    token = Token(TT_IDENTIFIER, text)
+            elif kind == "NUMBER":
+                token = self.make_number(text, match.span())
+            elif kind == "EQUALS":
+                end = match.end()
+                if end < len(self.text):
+                    raise NormalSyntaxError(f"Expected '=', not '{self.text[end]}'", (end, end + 1))
+                
+                raise NormalSyntaxError("Expected '='", (end, end))
+            else:
+                raise NormalSyntaxError(f"Unexpected character: '{text}'", match.span())
+            
+            append(token)
+            add_span(match.span())
+            last = token
+        
+        return tokens
+    
+    def make_number(self, text, span):
+        dots = text.count(".")
+        if not dots:
+            return Token(TT_NUMBER, int(text))
+        
+        if dots > 1:
+            raise NormalSyntaxError(f"Expect only one '.' in a number, got {dots}/1", span)
+        
+        if text == ".":
+            raise NormalSyntaxError("Expected digits around '.'", span)
+        
+        if DECIMAL_MODE:
+            return Token(TT_NUMBER, Decimal(text))
+        
+        return Token(TT_NUMBER, float(text))
+
+# Nodes
+# Nodes that can fail at runtime keep the span of the token they came from:
+# the operator for operations and the name for variables.
+class Literal:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+    
+    def __repr__(self):
+        return f"(LITERAL {to_text(self.value)})"
+
+class Name:
+    __slots__ = ("name", "span")
+
+    def __init__(self, name, span=None):
+        self.name = name
+        self.span = span
+    
+    def __repr__(self):
+        return f"(NAME {self.name})"
+
+class UnaryOperation:
+    __slots__ = ("operator", "operand", "span")
+
+    def __init__(self, operator, operand, span=None):
+        self.operator = operator
+        self.operand = operand
+        self.span = span
+    
+    def __repr__(self):
+        return f"(UNARY {TYPE_NAMES[self.operator]} {self.operand})"
+
+class BinaryOperation:
+    __slots__ = ("operator", "left", "right", "span", "length")
+
+    def __init__(self, operator, left, right, span=None):
+        self.operator = operator
+        self.left = left
+        self.right = right
+        self.span = span
+        self.length = chain_length(left) + 1
+    
+    def __repr__(self):
+        return f"(BINARY {TYPE_NAMES[self.operator]} {self.left} {self.right})"
+
+class LogicalOperation:
+    __slots__ = ("operator", "left", "right", "length")
+
+    def __init__(self, operator, left, right):
+        self.operator = operator
+        self.left = left
+        self.right = right
+        self.length = chain_length(left) + 1
+    
+    def __repr__(self):
+        return f"(LOGICAL {TYPE_NAMES[self.operator]} {self.left} {self.right})"
+
+class VariableDeclaration:
+    __slots__ = ("name", "value", "immutable", "span")
+
+    def __init__(self, name, value, immutable, span=None):
+        self.name = name
+        self.value = value
+        self.immutable = immutable
+        self.span = span
+    
+    def __repr__(self):
+        return f"(DECLARE {self.name} {self.value}) (immutable = {str(self.immutable).upper()})"
+
+class VariableUpdate:
+    __slots__ = ("name", "value", "span")
+
+    def __init__(self, name, value, span=None):
+        self.name = name
+        self.value = value
+        self.span = span
+    
+    def __repr__(self):
+        return f"(UPDATE {self.name} {self.value})"
+
+class IfChain:
+    __slots__ = ("branches", "else_case")
+
+    def __init__(self, branches, else_case):
+        self.branches = branches
+        self.else_case = else_case
+    
+    def __repr__(self):
+        branches = " ".join(f"({condition} {value})" for condition, value in self.branches)
+        return f"(IF {branches} (ELSE {self.else_case}))"
+
+# Left associative operators nest their chains down the left side, so
+# 1 + 2 + ... + n is n - 1 operations deep. Passes walk such a chain with a
+# loop instead of recursing into left operands, so only right operands,
+# parentheses and ^ make a pass recurse, however long a chain is. The
+# evaluators only loop over chains longer than NESTED_CHAIN and recurse into
+# shorter ones, which is faster.
+NESTED_CHAIN = 16
+
+def chain_length(node):
+    # Operations in the chain that ends at node
+    if type(node) is BinaryOperation or type(node) is LogicalOperation:
+        return node.length
+    
+    return 0
+
+def unchain(node):
+    # The operand at the bottom of the chain and the operations above it,
+    # innermost first
+    operations = []
+    while type(node) is BinaryOperation or type(node) is LogicalOperation:
+        operations.append(node)
+        node = node.left
+    
+    operations.reverse()
+    return node, operations
+
+# Parser
+# Expressions are parsed by precedence climbing: every operator binds
+# tighter than the ones below it, operands are parsed with a recursive call
+# at the operator's own level and each token is looked at once. Left
+# associative operators loop, so long flat chains never recurse.
+PRECEDENCE = {
+    TT_OR: 1,
+    TT_AND: 2,
+    TT_NOT: 3,
+    TT_EE: 4,
+    TT_NE: 4,
+    TT_GT: 4,
+    TT_GE: 4,
+    TT_SE: 4,
+    TT_ST: 4,
+    TT_PLUS: 5,
+    TT_MINUS: 5,
+    TT_MUL: 6,
+    TT_DIV: 6,
+    TT_POW: 8
+}
+
+# Unary + and - bind tighter than * but looser than ^, so -2 ^ 2 is -(2 ^ 2)
+UNARY_PRECEDENCE = 7
+
+LOGICAL_TYPES = {
+    "and": TT_AND,
+    "or": TT_OR,
+    "not": TT_NOT
+}
+
+OPERATOR_NAMES = {
+    TT_PLUS: "addition",
+    TT_MINUS: "subtraction"
+}
+for type_, (_, name) in BINARY_OPERATIONS.items():
+    OPERATOR_NAMES[type_] = name
+
+# Every group, operand and unary operator is parsed by a call to expression()
+# inside the one around it, and the passes over the tree recurse the same
+# way, so bounding how deep those calls go keeps every pass clear of Python's
+# recursion limit. Operator chains parse in a loop and never get deeper.
+NESTING_LIMIT = 100
+
+def nesting_error():
+    return NormalSyntaxError("Expression is nested too deeply")
+
+class Parser:
+    # A parser reads the tokens between start and end of a list it shares
+    # with the parsers nested inside it, so no token is ever copied. spans
+    # is the lexer's list of token positions; without it errors and nodes
+    # carry no span.
+    def __init__(self, tokens, start=0, end=None, spans=None, depth=0):
+        self.tokens = tokens
+        self.start = start
+        self.end = len(tokens) if end is None else end
+        self.spans = spans
+        self.depth = depth
+        self.index = start - 1
+        self.current_token = None
+        self.current_type = None
+        self.advance()
+    
+    def advance(self):
+        self.index += 1
+        self.current_token = self.tokens[self.index] if self.start <= self.index < self.end else None
+        self.current_type = None if self.current_token is None else self.current_token.type
+    
+    def move_back(self):
+        self.index -= 1
+        self.current_token = self.tokens[self.index] if self.start <= self.index < self.end else None
+        self.current_type = None if self.current_token is None else self.current_token.type
+    
+    def nested(self, start, end=None):
+        return Parser(self.tokens, start, self.end if end is None else end, self.spans, self.depth)
+    
+    def span(self):
+        if self.spans is None:
+            return None
+        
+        if self.current_token is not None:
+            return self.spans[self.index]
+        
+        # Past the last token of this parser, so point just after it
+        end = self.spans[self.end - 1][1] if self.end else 0
+        return end, end
+    
+    def error(self, reason, kind=NormalSyntaxError):
+        return kind(reason, self.span())
+    
+    def describe_current(self):
+        return NONE_VALUES_DICT.get(self.current_type, self.current_token.value)
+    
+    def generate_syntax_branch(self):
+        if self.start >= self.end:
+            raise self.error("No value to parse")
+
+        token = self.current_token
+        if token is KW_VARIABLE or token is KW_LET:
+            return self.variable_declaration()
+
+        if token is KW_CONSTANT:
+            return self.const_variable_declaration()
+        
+        if token is KW_ELSE:
+            self.advance()
+            if self.current_token is KW_IF:
+                raise self.error("else if has no parent if")
+            
+            raise self.error("else has no parent if")
+        
+        if token is KW_IF:
+            return self.if_statement()
+
+        if self.current_type == TT_IDENTIFIER:
+            self.advance()
+            if self.current_type == TT_KEYWORD and self.current_token.value not in LOGICAL_TYPES:
+                return self.update_variable()
+
+            self.move_back()
+
+        node = self.expression()
+        if self.current_token is not None:
+            raise self.unexpected()
+        
+        return node
+    
+    def operator_type(self):
+        # and/or/not arrive as keywords from the lexer
+        if self.current_type == TT_KEYWORD:
+            return LOGICAL_TYPES.get(self.current_token.value)
+        
+        return self.current_type
+    
+    def unexpected(self):
+        if self.current_type == TT_RPAREN:
+            return self.error("Unexpected ')'")
+        
+        if self.current_type == TT_KEYWORD and self.current_token.value not in LOGICAL_TYPES:
+            return self.error(f"'{self.current_token.value}' can't be in expressions")
+        
+        return self.error(f"Expected an operator, got '{self.describe_current()}'")
+    
+    def expression(self, precedence=0):
+        if self.depth == NESTING_LIMIT:
+            raise nesting_error().at(self.span())
+        
+        self.depth += 1
+        left = self.prefix()
+        while True:
+            type_ = self.operator_type()
+            operator_precedence = PRECEDENCE.get(type_)
+            if operator_precedence is None or operator_precedence <= precedence or type_ == TT_NOT:
+                self.depth -= 1
+                return left
+            
+            span = self.span()
+            self.advance()
+            if self.current_token is None:
+                if type_ == TT_AND or type_ == TT_OR:
+                    raise self.error(f"Too few values to perform '{NONE_VALUES_DICT[type_]}', got 1/2")
+                
+                raise self.error(f"Too few numbers to perform {OPERATOR_NAMES[type_]}, got 1/2")
+            
+            # ^ is right associative, so its right operand may hold another ^
+            right = self.expression(operator_precedence - 1 if type_ == TT_POW else operator_precedence)
+            if type_ == TT_AND or type_ == TT_OR:
+                left = LogicalOperation(type_, left, right)
+            else:
+                left = BinaryOperation(type_, left, right, span)
+    
+    def prefix(self):
+        token = self.current_token
+        if token is None:
+            raise self.error("Expected expression")
+        
+        type_ = self.operator_type()
+        if type_ in OFFICIAL_DATA_TYPES:
+            self.advance()
+            return Literal(token_value(token))
+        
+        if type_ == TT_IDENTIFIER:
+            span = self.span()
+            self.advance()
+            return Name(token.value, span)
+        
+        if type_ == TT_LPAREN:
+            self.advance()
+            if self.current_type == TT_RPAREN:
+                raise self.error("Expected expression")
+            
+            node = self.expression()
+            if self.current_type != TT_RPAREN:
+                if self.current_token is None:
+                    raise self.error("Unexpected '('")
+                
+                raise self.unexpected()
+            
+            self.advance()
+            return node
+        
+        if type_ == TT_MINUS or type_ == TT_PLUS or type_ == TT_NOT:
+            span = self.span()
+            self.advance()
+            if self.current_token is None:
+                if type_ == TT_NOT:
+                    raise self.error("Too few values to perform 'not', got 0/1")
+                
+                raise self.error(f"Too few numbers to perform {OPERATOR_NAMES[type_]}, got 0/2")
+            
+            operand = self.expression(PRECEDENCE[TT_NOT] if type_ == TT_NOT else UNARY_PRECEDENCE)
+            return UnaryOperation(type_, operand, span)
+        
+        if token is KW_IF:
+            return self.if_expression()
+        
+        if type_ == TT_KEYWORD:
+            raise self.error(f"'{token.value}' can't be in expressions")
+        
+        if type_ == TT_RPAREN:
+            raise self.error("Unexpected ')'")
+        
+        if type_ == TT_AND or type_ == TT_OR:
+            raise self.error(f"Too few values to perform '{NONE_VALUES_DICT[type_]}', got 0/2")
+        
+        if type_ in OPERATOR_NAMES:
+            raise self.error(f"Too few numbers to perform {OPERATOR_NAMES[type_]}, got 0/2")
+        
+        raise self.error(f"Unexpected character: '{self.describe_current()}'")
+    
+    def if_expression(self):
+        # An if inside an expression runs to the ')' that closes its group,
+        # or to the end of the line
+        depth = 0
+        start = self.index
+        while self.current_token is not None:
+            if self.current_type == TT_LPAREN:
+                depth += 1
+            elif self.current_type == TT_RPAREN:
+                if not depth:
+                    break
+                
+                depth -= 1
+            
+            self.advance()
+        
+        return self.nested(start, self.index).generate_syntax_branch()
+    
+    def variable_declaration(self):
+        keyword = self.current_token
+        self.advance()
+        if not self.current_token:
+            raise self.error("Expected identifier")
+        
+        if self.current_type != TT_IDENTIFIER:
+            raise self.error(f"Expected identifier, got '{self.describe_current()}'")
+        
+        variable_name = self.current_token.value
+        span = self.span()
+        self.advance()
+        if keyword is KW_VARIABLE:
+            if not self.current_token:
+                raise self.error("Expected 'is'")
+            
+            if self.current_token is not KW_IS:
+                raise self.error(f"Expected 'is', got '{self.describe_current()}'")
+        elif not self.current_token:
+            raise self.error("Expected 'be'")
+        elif self.current_token is not KW_BE:
+            raise self.error(f"Expected 'be', got '{self.describe_current()}'", NormalTypeError)
+        
+        self.advance()
+        value = self.nested(self.index).generate_syntax_branch()
+        return VariableDeclaration(variable_name, value, False, span)
+    
+    def const_variable_declaration(self):
+        self.advance()
+        if not self.current_token:
+            raise self.error("Expected identifier")
+        
+        if self.current_type != TT_IDENTIFIER:
+            raise self.error(f"Expected identifier, got '{self.describe_current()}'")
+        
+        variable_name = self.current_token.value
+        span = self.span()
+        self.advance()
+        if not self.current_token:
+            raise self.error("Expected 'is'")
+        
+        if self.current_token is not KW_IS:
+            raise self.error(f"Expected 'is', got '{self.describe_current()}'")
+        
+        self.advance()
+        value = self.nested(self.index).generate_syntax_branch()
+        return VariableDeclaration(variable_name, value, True, span)
+    
+    def update_variable(self):
+        self.move_back()
+        variable_name = self.current_token.value
+        span = self.span()
+
+        self.advance()
+        if self.current_token is not KW_IS:
+            raise self.error(f"Expected 'is', got '{self.describe_current()}'")
+        
+        self.advance()
+        if self.current_token is not KW_NOW:
+            if not self.current_token:
+                raise self.error("Expected 'now'")
+
+            raise self.error(f"Expected 'now', got '{self.describe_current()}'")
+        
+        self.advance()
+        value = self.nested(self.index).generate_syntax_branch()
+        return VariableUpdate(variable_name, value, span)
+    
+    def if_statement(self):
+        # Every branch of an else if chain is collected in one loop, each part
+        # parsed by a nested parser over its own range of the shared tokens
+        branches = []
+        while True:
+            self.advance()
+            
+            # check for condition
+            start = self.index
+            depth = 0
+            while (self.current_type != TT_COLON or depth) and self.current_token is not None:
+                if self.current_type == TT_LPAREN:
+                    depth += 1
+                elif self.current_type == TT_RPAREN:
+                    if not depth:
+                        raise self.error("Unexpected ')'")
+                    
+                    depth -= 1
+                
+                self.advance()
+            
+            if self.index == start:
+                raise self.error("Expected condition")
+            
+            if not self.current_token:
+                raise self.error("Expected ':'")
+            
+            condition = self.nested(start, self.index).generate_syntax_branch()
+            
+            # check for value
+            self.advance()
+            start = self.index
+            depth = 0
+            while (self.current_token is not KW_ELSE or depth) and self.current_token is not None:
+                if self.current_type == TT_LPAREN:
+                    depth += 1
+                elif self.current_type == TT_RPAREN:
+                    if not depth:
+                        raise self.error("Unexpected ')'")
+                    
+                    depth -= 1
+                
+                self.advance()
+            
+            if self.index == start:
+                raise self.error("Expected value")
+            
+            value = self.nested(start, self.index).generate_syntax_branch()
+            branches.append((condition, value))
+            if not self.current_token:
+                return IfChain(branches, None)
+            
+            self.advance()
+            if self.current_token is None:
+                raise self.error("Expected 'if' or ':'")
+            
+            if self.current_token is not KW_IF and self.current_type != TT_COLON:
+                raise self.error(f"Expected 'if' or ':', not '{self.describe_current()}'")
+            
+            if self.current_token is not KW_IF:
+                break
+        
+        self.advance()
+        if self.current_token is None:
+            raise self.error("Expected value")
+        
+        else_case = self.nested(self.index).generate_syntax_branch()
+        return IfChain(branches, else_case)
+
+# Optimizer
+ARITHMETIC_OPERATORS = frozenset([TT_PLUS, TT_MINUS, TT_MUL, TT_DIV, TT_POW])
+COMPARISON_OPERATORS = frozenset([TT_EE, TT_NE, TT_GT, TT_GE, TT_ST, TT_SE])
+
+# Operations that return their left operand as a number when the right one
+# is this constant, and the same for the right operand on the left
+RIGHT_IDENTITIES = {
+    TT_PLUS: 0,
+    TT_MINUS: 0,
+    TT_MUL: 1,
+    TT_DIV: 1,
+    TT_POW: 1
+}
+
+LEFT_IDENTITIES = {
+    TT_PLUS: 0,
+    TT_MUL: 1
+}
+
+def is_number_literal(node, value):
+    return isinstance(node, Literal) and node.value is not True and node.value is not False and node.value == value
+
+def is_not(node):
+    return isinstance(node, UnaryOperation) and node.operator == TT_NOT
+
+def produces_number(node):
+    # Arithmetic results are already normalized numbers, so coercing them again
+    # is a no-op
+    if isinstance(node, UnaryOperation):
+        return node.operator != TT_NOT
+    
+    return isinstance(node, BinaryOperation) and node.operator in ARITHMETIC_OPERATORS
+
+def produces_boolean(node):
+    if isinstance(node, Literal):
+        return node.value is True or node.value is False
+    
+    if isinstance(node, BinaryOperation):
+        return node.operator in COMPARISON_OPERATORS
+    
+    return isinstance(node, LogicalOperation) or is_not(node)
+
+class Optimizer:
+    def optimize(self, node):
+        return OPTIMIZERS[type(node)](self, node)
+    
+    def fold(self, operation, *operands):
+        # Anything the runtime would report or crash on is left for the runtime
+        try:
+            return Literal(operation(*operands))
+        except (Error, ArithmeticError, TypeError, ValueError):
+            return None
+    
+    def as_number(self, node, span):
+        if produces_number(node):
+            return node
+        
+        return self.unary(TT_PLUS, node, span)
+    
+    def optimize_condition(self, node):
+        return self.as_condition(self.optimize(node))
+    
+    def as_condition(self, node):
+        # Only the truthiness of a condition is used, so 'not not x' is just x
+        while is_not(node) and is_not(node.operand):
+            node = node.operand.operand
+        
+        return node
+    
+    def optimize_literal(self, node):
+        return node
+    
+    def optimize_name(self, node):
+        return node
+    
+    def optimize_unary(self, node):
+        if node.operator == TT_NOT:
+            operand = self.optimize_condition(node.operand)
+            if is_not(operand) and produces_boolean(operand.operand):
+                return operand.operand
+        else:
+            operand = self.optimize(node.operand)
+
+        return self.unary(node.operator, operand, node.span)
+    
+    def unary(self, operator, operand, span):
+        if isinstance(operand, Literal):
+            folded = self.fold(UNARY_OPERATIONS[operator], operand.value)
+            if folded:
+                return folded
+        
+        if operator == TT_PLUS and produces_number(operand):
+            return operand
+        
+        return UnaryOperation(operator, operand, span)
+    
+    def optimize_chain(self, node):
+        bottom, operations = unchain(node)
+        left = self.optimize(bottom)
+        for operation in operations:
+            if type(operation) is LogicalOperation:
+                left = self.logical(operation, self.as_condition(left), self.optimize_condition(operation.right))
+            else:
+                left = self.binary(operation, left, self.optimize(operation.right))
+        
+        return left
+    
+    def binary(self, node, left, right):
+        operator = node.operator
+        if isinstance(left, Literal) and isinstance(right, Literal):
+            folded = self.fold(OPERATIONS[operator], left.value, right.value)
+            if folded:
+                return folded
+        
+        if operator in RIGHT_IDENTITIES and is_number_literal(right, RIGHT_IDENTITIES[operator]):
+            return self.as_number(left, node.span)
+        
+        if operator in LEFT_IDENTITIES and is_number_literal(left, LEFT_IDENTITIES[operator]):
+            return self.as_number(right, node.span)
+        
+        return BinaryOperation(operator, left, right, node.span)
+    
+    def logical(self, node, left, right):
+        if isinstance(left, Literal):
+            # The right operand is never evaluated once the left one decides
+            if node.operator == TT_AND and not left.value:
+                return Literal(False)
+            
+            if node.operator == TT_OR and left.value:
+                return Literal(True)
+            
+            if isinstance(right, Literal):
+                return Literal(bool(right.value))
+            
+            if produces_boolean(right):
+                return right
+        
+        return LogicalOperation(node.operator, left, right)
+    
+    def optimize_variable_declaration(self, node):
+        return VariableDeclaration(node.name, self.optimize(node.value), node.immutable, node.span)
+    
+    def optimize_variable_update(self, node):
+        return VariableUpdate(node.name, self.optimize(node.value), node.span)
+    
+    def optimize_if(self, node):
+        branches = []
+        for condition, value in node.branches:
+            condition = self.optimize_condition(condition)
+            value = self.optimize(value)
+            if not isinstance(condition, Literal):
+                branches += [(condition, value)]
+                continue
+
+            if condition.value:
+                # Nothing after a branch that is always taken can run
+                if not branches:
+                    return value
+                
+                return IfChain(branches, value)
+        
+        else_case = None if node.else_case is None else self.optimize(node.else_case)
+        if not branches:
+            return Literal(None) if else_case is None else else_case
+        
+        return IfChain(branches, else_case)
+
+OPTIMIZERS = {
+    Literal: Optimizer.optimize_literal,
+    Name: Optimizer.optimize_name,
+    UnaryOperation: Optimizer.optimize_unary,
+    BinaryOperation: Optimizer.optimize_chain,
+    LogicalOperation: Optimizer.optimize_chain,
+    VariableDeclaration: Optimizer.optimize_variable_declaration,
+    VariableUpdate: Optimizer.optimize_variable_update,
+    IfChain: Optimizer.optimize_if
+}
+
+def optimize(node):
+    return Optimizer().optimize(node)
+
+# Interpreter
+# The tree walker has no compile step, so it looks each name up in the table
+# as it meets it
+class Interpreter:
+    def __init__(self, node, table=None):
+        self.node = node
+        self.table = symbol_table if table is None else table
+    
+    def run(self):
+        return self.visit(self.node)
+    
+    def visit(self, node):
+        return VISITORS[type(node)](self, node)
+    
+    def run_literal(self, node):
+        return node.value
+    
+    def run_name(self, node):
+        table = self.table
+        slot = table.slots.get(node.name)
+        if slot is not None:
+            value = table.values[slot]
+            if value is not UNDEFINED:
+                return value
+        
+        raise undefined_error(node.name).at(node.span)
+    
+    def run_unary(self, node):
+        operand = self.visit(node.operand)
+        try:
+            return UNARY_OPERATIONS[node.operator](operand)
+        except Error as error:
+            raise error.at(node.span)
+
+    # run_binary and run_logical recurse into short chains and inline
+    # binary() and logical(), since most operations run there
+    def run_binary(self, node):
+        if node.length > NESTED_CHAIN:
+            return self.run_chain(node)
+        
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        try:
+            if node.operator == TT_PLUS:
+                return add(left, right)
+            
+            if node.operator == TT_MINUS:
+                return subtract(left, right)
+            
+            return BINARY_OPERATIONS[node.operator][0](left, right)
+        except Error as error:
+            raise error.at(node.span)
+    
+    def run_logical(self, node):
+        if node.length > NESTED_CHAIN:
+            return self.run_chain(node)
+        
+        left = self.visit(node.left)
+        if node.operator == TT_AND:
+            if not left:
+                return False
+        elif left:
+            return True
+        
+        return bool(self.visit(node.right))
+    
+    def run_chain(self, node):
+        bottom, operations = unchain(node)
+        value = self.visit(bottom)
+        for operation in operations:
+            if type(operation) is LogicalOperation:
+                value = self.logical(operation, value)
+            else:
+                value = self.binary(operation, value)
+        
+        return value
+    
+    def binary(self, node, left):
+        right = self.visit(node.right)
+        try:
+            if node.operator == TT_PLUS:
+                return add(left, right)
+            
+            if node.operator == TT_MINUS:
+                return subtract(left, right)
+            
+            return BINARY_OPERATIONS[node.operator][0](left, right)
+        except Error as error:
+            raise error.at(node.span)
+    
+    def logical(self, node, left):
+        if node.operator == TT_AND:
+            if not left:
+                return False
+        elif left:
+            return True
+        
+        return bool(self.visit(node.right))
+    
+    def run_variable_declaration(self, node):
+        value = self.visit(node.value)
+        try:
+            return self.table.declare(node.name, value, node.immutable)
+        except Error as error:
+            raise error.at(node.span)
+    
+    def run_variable_update(self, node):
+        value = self.visit(node.value)
+        try:
+            return self.table.assign(node.name, value)
+        except Error as error:
+            raise error.at(node.span)
+    
+    def run_if(self, node):
+        for condition_branch, value_branch in node.branches:
+            if self.visit(condition_branch):
+                return self.visit(value_branch)
+
+        if node.else_case is None:
+            return None
+        
+        return self.visit(node.else_case)
+
+VISITORS = {
+    Literal: Interpreter.run_literal,
+    Name: Interpreter.run_name,
+    UnaryOperation: Interpreter.run_unary,
+    BinaryOperation: Interpreter.run_binary,
+    LogicalOperation: Interpreter.run_logical,
+    VariableDeclaration: Interpreter.run_variable_declaration,
+    VariableUpdate: Interpreter.run_variable_update,
+    IfChain: Interpreter.run_if
+}
+
+# Bytecode
+(
+    OP_BINARY_CONST,
+    OP_SLOT_BINARY_CONST,
+    OP_BINARY,
+    OP_BINARY_SLOT,
+    OP_JUMP_IF_FALSE,
+    OP_JUMP,
+    OP_JUMP_IF_FALSE_OR_POP,
+    OP_JUMP_IF_TRUE_OR_POP,
+    OP_LOAD_SLOT,
+    OP_LOAD_CONST,
+    OP_TO_BOOLEAN,
+    OP_UNARY,
+    OP_DECLARE,
+    OP_DECLARE_CONST,
+    OP_UPDATE
+) = range(15)
+
+# An instruction is one int, its argument shifted past the opcode. The binary
+# forms pack their operands into the argument next to an operator tag: a
+# constant index for OP_BINARY_CONST, a slot for OP_BINARY_SLOT and both for
+# OP_SLOT_BINARY_CONST, which loads a variable and applies an operator and
+# constant to it in one instruction.
+OPCODE_BITS = 4
+OPCODE_MASK = (1 << OPCODE_BITS) - 1
+OPERATOR_BITS = 5
+OPERATOR_MASK = (1 << OPERATOR_BITS) - 1
+CONSTANT_BITS = 11
+CONSTANT_MASK = (1 << CONSTANT_BITS) - 1
+SLOT_SHIFT = CONSTANT_BITS + OPERATOR_BITS
+# Instructions are signed 32 bit ints
+SLOT_LIMIT = 1 << (31 - OPCODE_BITS - SLOT_SHIFT)
+
+# Indexed by the operator's token type, so OP_BINARY's argument is the tag itself
+OPERATIONS = [None] * len(TYPE_NAMES)
+OPERATIONS[TT_PLUS] = add
+OPERATIONS[TT_MINUS] = subtract
+for type_, (operation, _) in BINARY_OPERATIONS.items():
+    OPERATIONS[type_] = operation
+
+class Code:
+    __slots__ = ("code", "constants", "spans", "name_spans", "names", "binding")
+
+    def __init__(self, code, constants, spans=None, name_spans=None, names=()):
+        self.code = code
+        self.constants = constants
+        # Instruction index: span, for the instructions that can fail, and
+        # the span of the name for the binary forms that load a variable
+        self.spans = {} if spans is None else spans
+        self.name_spans = {} if name_spans is None else name_spans
+        # Slot arguments index names; see SymbolTable.bind
+        self.names = names
+        self.binding = (None, None)
+    
+    def __repr__(self):
+        return f"(CODE {len(self.code)} instructions)"
+
+class Compiler:
+    def __init__(self):
+        self.code = array("i")
+        self.constants = []
+        self.constant_indexes = {}
+        self.spans = {}
+        self.name_spans = {}
+        self.names = {}
+    
+    def compile(self, node):
+        self.visit(node)
+        return Code(self.code, self.constants, self.spans, self.name_spans, list(self.names))
+    
+    def visit(self, node):
+        COMPILERS[type(node)](self, node)
+    
+    def emit(self, op, arg=0, span=None):
+        self.code.append(arg << OPCODE_BITS | op)
+        if span is not None:
+            self.spans[len(self.code) - 1] = span
+        
+        return len(self.code) - 1
+    
+    def patch(self, jump):
+        # Points a jump emitted without an argument at the next instruction
+        self.code[jump] |= len(self.code) << OPCODE_BITS
+    
+    def constant(self, value):
+        # True == 1 == 1.0 in Python, so the pool is keyed by type as well
+        key = (type(value), value)
+        if key not in self.constant_indexes:
+            self.constant_indexes[key] = len(self.constants)
+            self.constants += [value]
+        
+        return self.constant_indexes[key]
+    
+    def local(self, name):
+        return self.names.setdefault(name, len(self.names))
+    
+    def compile_literal(self, node):
+        self.emit(OP_LOAD_CONST, self.constant(node.value))
+    
+    def compile_name(self, node):
+        self.emit(OP_LOAD_SLOT, self.local(node.name), node.span)
+    
+    def compile_unary(self, node):
+        self.visit(node.operand)
+        self.emit(OP_UNARY, node.operator, node.span)
+    
+    def compile_chain(self, node):
+        bottom, operations = unchain(node)
+        if type(bottom) is Name and self.compile_slot_binary_const(bottom, operations[0]):
+            operations = operations[1:]
+        else:
+            self.visit(bottom)
+        
+        for operation in operations:
+            if type(operation) is LogicalOperation:
+                self.compile_logical(operation)
+            else:
+                self.compile_binary(operation)
+    
+    def compile_slot_binary_const(self, name, node):
+        if type(node) is not BinaryOperation or type(node.right) is not Literal:
+            return False
+        
+        slot = self.local(name.name)
+        constant = self.constant(node.right.value)
+        if slot >= SLOT_LIMIT or constant > CONSTANT_MASK:
+            return False
+        
+        index = self.emit(OP_SLOT_BINARY_CONST, (slot << CONSTANT_BITS | constant) << OPERATOR_BITS | node.operator, node.span)
+        self.name_spans[index] = name.span
+        return True
+    
+    def compile_binary(self, node):
+        # The left operand is already on the stack
+        if type(node.right) is Literal:
+            self.emit(OP_BINARY_CONST, self.constant(node.right.value) << OPERATOR_BITS | node.operator, node.span)
+        elif type(node.right) is Name:
+            index = self.emit(OP_BINARY_SLOT, self.local(node.right.name) << OPERATOR_BITS | node.operator, node.span)
+            self.name_spans[index] = node.right.span
+        else:
+            self.visit(node.right)
+            self.emit(OP_BINARY, node.operator, node.span)
+    
+    def compile_logical(self, node):
+        jump = self.emit(OP_JUMP_IF_FALSE_OR_POP if node.operator == TT_AND else OP_JUMP_IF_TRUE_OR_POP)
+        self.visit(node.right)
+        if not produces_boolean(node.right):
+            self.emit(OP_TO_BOOLEAN)
+        
+        self.patch(jump)
+    
+    def compile_variable_declaration(self, node):
+        self.visit(node.value)
+        self.emit(OP_DECLARE_CONST if node.immutable else OP_DECLARE, self.local(node.name), node.span)
+    
+    def compile_variable_update(self, node):
+        self.visit(node.value)
+        self.emit(OP_UPDATE, self.local(node.name), node.span)
+    
+    def compile_if(self, node):
+        exits = []
+        for condition, value in node.branches:
+            self.visit(condition)
+            skip = self.emit(OP_JUMP_IF_FALSE)
+            self.visit(value)
+            exits += [self.emit(OP_JUMP)]
+            self.patch(skip)
+        
+        if node.else_case is None:
+            self.emit(OP_LOAD_CONST, self.constant(None))
+        else:
+            self.visit(node.else_case)
+        
+        for index in exits:
+            self.patch(index)
+
+COMPILERS = {
+    Literal: Compiler.compile_literal,
+    Name: Compiler.compile_name,
+    UnaryOperation: Compiler.compile_unary,
+    BinaryOperation: Compiler.compile_chain,
+    LogicalOperation: Compiler.compile_chain,
+    VariableDeclaration: Compiler.compile_variable_declaration,
+    VariableUpdate: Compiler.compile_variable_update,
+    IfChain: Compiler.compile_if
+}
+
+# Virtual machine
+# The loop tests the opcodes that run most first: the binary forms, which
+# inline the common operators on two ints, then the jumps, then slot and
+# constant loads, which are mostly folded into the binary forms. Stores and
+# the rest come after.
+def run_code(program, table):
+    code = program.code
+    constants = program.constants
+    serial, slots = program.binding
+    if serial != table.serial:
+        slots = table.bind(program)
+    
+    values = table.values
+    
+    # The top of the stack lives in top, the rest in stack
+    top = None
+    stack = []
+    pc = 0
+    end = len(code)
+    try:
+        while pc < end:
+            instruction = code[pc]
+            op = instruction & OPCODE_MASK
+            arg = instruction >> OPCODE_BITS
+            pc += 1
+            if op <= OP_BINARY_SLOT:
+                if op == OP_BINARY_CONST:
+                    a = top
+                    b = constants[arg >> OPERATOR_BITS]
+                elif op == OP_SLOT_BINARY_CONST:
+                    a = values[slots[arg >> SLOT_SHIFT]]
+                    if a is UNDEFINED:
+                        raise undefined_error(program.names[arg >> SLOT_SHIFT]).at(program.name_spans.get(pc - 1))
+                    
+                    stack.append(top)
+                    b = constants[arg >> OPERATOR_BITS & CONSTANT_MASK]
+                elif op == OP_BINARY:
+                    a = stack.pop()
+                    b = top
+                else:
+                    a = top
+                    b = values[slots[arg >> OPERATOR_BITS]]
+                    if b is UNDEFINED:
+                        raise undefined_error(program.names[arg >> OPERATOR_BITS]).at(program.name_spans.get(pc - 1))
+                
+                arg &= OPERATOR_MASK
+                # Fast paths for the common operators on two ints; anything
+                # else, including every error case, goes through the
+                # operation table
+                if type(a) is not int or type(b) is not int:
+                    top = OPERATIONS[arg](a, b)
+                elif arg == TT_PLUS:
+                    top = a + b
+                elif arg == TT_MINUS:
+                    top = a - b
+                elif arg == TT_MUL:
+                    if a.bit_length() + b.bit_length() > MAX_INT_BITS:
+                        raise too_large_error(a, "*", b)
+                    
+                    top = a * b
+                elif arg == TT_GT:
+                    top = a > b
+                elif arg == TT_ST:
+                    top = a < b
+                else:
+                    top = OPERATIONS[arg](a, b)
+            elif op <= OP_JUMP_IF_TRUE_OR_POP:
+                if op == OP_JUMP_IF_FALSE:
+                    if not top:
+                        pc = arg
+                    
+                    top = stack.pop()
+                elif op == OP_JUMP:
+                    pc = arg
+                elif op == OP_JUMP_IF_FALSE_OR_POP:
+                    if top:
+                        top = stack.pop()
+                    else:
+                        top = False
+                        pc = arg
+                elif top:
+                    top = True
+                    pc = arg
+                else:
+                    top = stack.pop()
+            elif op == OP_LOAD_SLOT:
+                stack.append(top)
+                top = values[slots[arg]]
+                if top is UNDEFINED:
+                    raise undefined_error(program.names[arg])
+            elif op == OP_LOAD_CONST:
+                stack.append(top)
+                top = constants[arg]
+            elif op == OP_TO_BOOLEAN:
+                top = bool(top)
+            elif op == OP_UNARY:
+                top = UNARY_OPERATIONS[arg](top)
+            elif op == OP_DECLARE or op == OP_DECLARE_CONST:
+                table.declare_slot(slots[arg], top, op == OP_DECLARE_CONST)
+            elif op == OP_UPDATE:
+                table.assign_slot(slots[arg], top)
+        
+        return top
+    except Error as error:
+        # pc has already moved past the instruction that failed
+        raise error.at(program.spans.get(pc - 1))
+
+class VirtualMachine:
+    def __init__(self, code, table=None):
+        self.code = code
+        self.table = symbol_table if table is None else table
+    
+    def run(self):
+        return run_code(self.code, self.table)
+
+def compile_node(node):
+    return Compiler().compile(node)
+
+# Closure compiler
+class Closure:
+    __slots__ = ("function", "names", "binding")
+
+    def __init__(self, function, names):
+        self.function = function
+        # Slot numbers in the closures index names; see SymbolTable.bind
+        self.names = names
+        self.binding = (None, None)
+    
+    def __repr__(self):
+        return f"(CLOSURE {', '.join(self.names)})"
+
+class ClosureCompiler:
+    def __init__(self):
+        self.names = {}
+    
+    def compile(self, node):
+        return CLOSURE_COMPILERS[type(node)](self, node)
+    
+    def local(self, name):
+        return self.names.setdefault(name, len(self.names))
+    
+    def compile_literal(self, node):
+        value = node.value
+
+        def literal(table, slots):
+            return value
+        
+        return literal
+    
+    def compile_name(self, node):
+        name = node.name
+        slot = self.local(name)
+        span = node.span
+
+        def load(table, slots):
+            value = table.values[slots[slot]]
+            if value is UNDEFINED:
+                raise undefined_error(name).at(span)
+            
+            return value
+        
+        return load
+    
+    def compile_unary(self, node):
+        operation = UNARY_OPERATIONS[node.operator]
+        operand = self.compile(node.operand)
+        span = node.span
+
+        def unary(table, slots):
+            value = operand(table, slots)
+            try:
+                return operation(value)
+            except Error as error:
+                raise error.at(span)
+        
+        return unary
+    
+    def compile_chain(self, node):
+        # Each operation's closure calls the closure of the one below it, so
+        # a chain nests one call deeper per operation when it runs; longer
+        # chains run as a loop over one step per operation instead
+        bottom, operations = unchain(node)
+        function = self.compile(bottom)
+        if len(operations) > NESTED_CHAIN:
+            return self.compile_steps(function, operations)
+        
+        for operation in operations:
+            if type(operation) is LogicalOperation:
+                function = self.compile_logical(operation, function)
+            else:
+                function = self.compile_binary(operation, function)
+        
+        return function
+    
+    def compile_binary(self, node, left):
+        operation = OPERATIONS[node.operator]
+        span = node.span
+        if isinstance(node.right, Literal):
+            constant = node.right.value
+
+            def binary_constant(table, slots):
+                a = left(table, slots)
+                try:
+                    return operation(a, constant)
+                except Error as error:
+                    raise error.at(span)
+            
+            return binary_constant
+        
+        right = self.compile(node.right)
+
+        def binary(table, slots):
+            a = left(table, slots)
+            b = right(table, slots)
+            try:
+                return operation(a, b)
+            except Error as error:
+                raise error.at(span)
+        
+        return binary
+    
+    def compile_logical(self, node, left):
+        right = self.compile(node.right)
+        if node.operator == TT_AND:
+            def logical_and(table, slots):
+                if not left(table, slots):
+                    return False
+                
+                return bool(right(table, slots))
+            
+            return logical_and
+        
+        def logical_or(table, slots):
+            if left(table, slots):
+                return True
+            
+            return bool(right(table, slots))
+        
+        return logical_or
+    
+    def compile_steps(self, bottom, operations):
+        steps = [self.compile_step(operation) for operation in operations]
+
+        def chain(table, slots):
+            value = bottom(table, slots)
+            for step in steps:
+                value = step(value, table, slots)
+            
+            return value
+        
+        return chain
+    
+    def compile_step(self, node):
+        # A step takes the value of everything below it in the chain
+        right = self.compile(node.right)
+        if type(node) is LogicalOperation:
+            short = node.operator == TT_OR
+
+            def logical_step(a, table, slots):
+                if bool(a) is short:
+                    return short
+                
+                return bool(right(table, slots))
+            
+            return logical_step
+        
+        operation = OPERATIONS[node.operator]
+        span = node.span
+
+        def binary_step(a, table, slots):
+            b = right(table, slots)
+            try:
+                return operation(a, b)
+            except Error as error:
+                raise error.at(span)
+        
+        return binary_step
+    
+    def compile_variable_declaration(self, node):
+        slot = self.local(node.name)
+        immutable = node.immutable
+        value = self.compile(node.value)
+        span = node.span
+
+        def declare(table, slots):
+            res = value(table, slots)
+            try:
+                return table.declare_slot(slots[slot], res, immutable)
+            except Error as error:
+                raise error.at(span)
+        
+        return declare
+    
+    def compile_variable_update(self, node):
+        slot = self.local(node.name)
+        value = self.compile(node.value)
+        span = node.span
+
+        def update(table, slots):
+            res = value(table, slots)
+            try:
+                return table.assign_slot(slots[slot], res)
+            except Error as error:
+                raise error.at(span)
+        
+        return update
+    
+    def compile_if(self, node):
+        branches = [(self.compile(condition), self.compile(value)) for condition, value in node.branches]
+        else_case = None if node.else_case is None else self.compile(node.else_case)
+
+        def if_chain(table, slots):
+            for condition, value in branches:
+                if condition(table, slots):
+                    return value(table, slots)
+            
+            if else_case is None:
+                return None
+            
+            return else_case(table, slots)
+        
+        return if_chain
+
+CLOSURE_COMPILERS = {
+    Literal: ClosureCompiler.compile_literal,
+    Name: ClosureCompiler.compile_name,
+    UnaryOperation: ClosureCompiler.compile_unary,
+    BinaryOperation: ClosureCompiler.compile_chain,
+    LogicalOperation: ClosureCompiler.compile_chain,
+    VariableDeclaration: ClosureCompiler.compile_variable_declaration,
+    VariableUpdate: ClosureCompiler.compile_variable_update,
+    IfChain: ClosureCompiler.compile_if
+}
+
+def compile_closure(node):
+    compiler = ClosureCompiler()
+    function = compiler.compile(node)
+    return Closure(function, list(compiler.names))
+
+# Engines
+# Each engine compiles a parsed node once and can then execute the result
+# any number of times against a symbol table.
+def execute_tree(node, table):
+    return Interpreter(node, table).run()
+
+def execute_code(code, table):
+    return run_code(code, symbol_table if table is None else table)
+
+def execute_closure(closure, table):
+    table = symbol_table if table is None else table
+    serial, slots = closure.binding
+    if serial != table.serial:
+        slots = table.bind(closure)
+    
+    return closure.function(table, slots)
+
+ENGINES = {
+    "tree": (lambda node: node, execute_tree),
+    "vm": (compile_node, execute_code),
+    "closure": (compile_closure, execute_closure)
+}
+
+# The closure engine runs two to four times faster than the others here. The
+# bytecode VM keeps up with the tree walker on single expressions and pulls
+# ahead on scripts that read and write many variables
+DEFAULT_ENGINE = "closure"
+
+def parse(snippet):
+    lexer = Lexer(snippet)
+    tokens = lexer.make_tokens()
+    parser = Parser(tokens, spans=lexer.spans)
+    return parser.generate_syntax_branch()
+
+# Program cache
+class ProgramCache:
+    def __init__(self, size=256):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+    
+    def get(self, snippet, engine=DEFAULT_ENGINE):
+        # Compiled programs only hold names, never values or table slots, so
+        # an entry stays valid however the symbol table changes between runs
+        # and can be shared by every thread
+        key = (engine, snippet)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return entry
+            
+            self.misses += 1
+        
+        # Compile outside the lock; two threads missing on the same snippet
+        # both compile it and the later one wins, which is harmless. A snippet
+        # that fails to compile is cached with its error.
+        node = program = error = None
+        try:
+            node = parse(snippet)
+            program = ENGINES[engine][0](optimize(node))
+        except Error as exception:
+            node, error = None, exception
+        
+        entry = (node, program, error)
+        with self.lock:
+            self.entries[key] = entry
+            self.trim()
+        
+        return entry
+    
+    def trim(self):
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def resize(self, size):
+        with self.lock:
+            self.size = size
+            self.trim()
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def info(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "size": self.size
+            }
+    
+    def __repr__(self):
+        return f"(PROGRAM CACHE: {len(self.entries)}/{self.size}, hits = {self.hits}, misses = {self.misses}, evictions = {self.evictions})"
+
+program_cache = ProgramCache()
+
+def set_decimal_mode(enabled, precision=None):
+    global DECIMAL_MODE
+    DECIMAL_MODE = enabled
+    if precision is not None:
+        DECIMAL_CONTEXT.prec = precision
+    
+    # Number literals now lex to a different type, so cached programs are stale
+    program_cache.clear()
+
+def output_of(node, res, error):
+    if error:
+        return error.as_string()
+    
+    # An if statement without a matching branch produces no output
+    if res is None and isinstance(node, IfChain):
+        return None
+    
+    return to_text(res)
+
+def run_statement(execute_program, code, table):
+    # Errors stop here and become the statement's result. A statement that
+    # fails takes back every store it made before failing, so a line either
+    # happens completely or not at all.
+    journal = table.journal
+    if journal is not None:
+        snapshot = len(journal)
+        try:
+            return execute_program(code, table), None
+        except Error as error:
+            table.restore(snapshot)
+            return None, error
+    
+    # Nobody holds a snapshot, so the journal only lives for this statement
+    table.journal = []
+    try:
+        return execute_program(code, table), None
+    except Error as error:
+        table.restore(0)
+        return None, error
+    finally:
+        table.journal = None
+
+def run(snippet, table=None, engine=DEFAULT_ENGINE):
+    node, program, error = program_cache.get(snippet, engine)
+    if error:
+        print(error.as_string())
+        return
+
+    table = symbol_table if table is None else table
+    res, error = run_statement(ENGINES[engine][1], program, table)
+    text = output_of(node, res, error)
+    if text is not None:
+        print(text)
+
+# Programs
+class Statement:
+    __slots__ = ("line", "source", "node", "code", "error")
+
+    def __init__(self, line, source, node, code, error):
+        self.line = line
+        self.source = source
+        self.node = node
+        self.code = code
+        self.error = error
+    
+    def __repr__(self):
+        return f"(STATEMENT {self.line}: {self.source.strip()})"
+
+class Program:
+    __slots__ = ("engine", "statements")
+
+    def __init__(self, engine, statements):
+        self.engine = engine
+        self.statements = statements
+    
+    def __repr__(self):
+        return f"(PROGRAM {self.engine}: {len(self.statements)} statements)"
+
+def compile_source(text, engine=DEFAULT_ENGINE):
+    # Every non-blank line is a statement of its own; a line that fails to
+    # parse keeps its error so the rest of the program still runs
+    statements = []
+    for line, source in enumerate(text.split("\n"), 1):
+        if not source.strip():
+            continue
+
+        node, code, error = program_cache.get(source, engine)
+        statements.append(Statement(line, source, node, code, error))
+    
+    return Program(engine, statements)
+
+def execute(program, table=None):
+    execute_program = ENGINES[program.engine][1]
+    table = symbol_table if table is None else table
+    results = []
+    for statement in program.statements:
+        if statement.error:
+            results.append((None, statement.error))
+            continue
+
+        results.append(run_statement(execute_program, statement.code, table))
+    
+    return results
+
+def run_file(path, table=None, engine=DEFAULT_ENGINE):
+    with open(path) as file:
+        program = compile_source(file.read(), engine)
+    
+    results = execute(program, table)
+    for statement, (res, error) in zip(program.statements, results):
+        text = output_of(statement.node, res, error)
+        if text is not None:
+            print(text)
+    
+    return results
+
+# Sessions
+class Session:
+    # A session owns its symbol table, so sessions never see each other's
+    # variables; the lock keeps one session consistent when it is shared
+    # between threads, while separate sessions run independently
+    def __init__(self, engine=DEFAULT_ENGINE, table=None):
+        self.engine = engine
+        self.table = SymbolTable() if table is None else table
+        self.lock = RLock()
+    
+    def compile(self, text):
+        return compile_source(text, self.engine)
+    
+    def execute(self, program):
+        with self.lock:
+            return execute(program, self.table)
+    
+    def run(self, text):
+        return self.execute(self.compile(text))
+    
+    def __repr__(self):
+        return f"(SESSION {self.engine}: {self.table!r})"
@@ -0,0 +1,240 @@
+from time import perf_counter
+
+from .interpreter import (
+    BinaryOperation,
+    Error,
+    IfChain,
+    Interpreter,
+    Lexer,
+    LogicalOperation,
+    Parser,
+    TYPE_NAMES,
+    UnaryOperation,
+    VariableDeclaration,
+    VariableUpdate,
+    VISITORS,
+    nesting_error,
+    output_of,
+    run_statement,
+    symbol_table,
+    unchain
+)
+
+# Profiling
+# Profiled runs go through their own instrumented tree walker, so the normal
+# engines carry no counters or timers at all. Operators are profiled as they
+# appear in the source: constant folding is skipped so nothing is hidden.
+class LineProfile:
+    __slots__ = ("line", "source", "lex", "parse", "evaluate")
+
+    def __init__(self, line, source, lex, parse, evaluate):
+        self.line = line
+        self.source = source
+        self.lex = lex
+        self.parse = parse
+        self.evaluate = evaluate
+
+    @property
+    def total(self):
+        return self.lex + self.parse + self.evaluate
+
+    def as_dict(self):
+        return {
+            "line": self.line,
+            "source": self.source,
+            "lex": self.lex,
+            "parse": self.parse,
+            "evaluate": self.evaluate,
+            "total": self.total
+        }
+
+class Profile:
+    LINE_KEYS = {
+        "line": lambda line: line.line,
+        "lex": lambda line: -line.lex,
+        "parse": lambda line: -line.parse,
+        "evaluate": lambda line: -line.evaluate,
+        "time": lambda line: -line.total
+    }
+    OPERATOR_KEYS = {
+        "name": lambda item: item[0],
+        "count": lambda item: -item[1][0],
+        "time": lambda item: -item[1][1]
+    }
+
+    def __init__(self):
+        self.lines = []
+        # name: [count, cumulative seconds]
+        self.operators = {}
+
+    def count(self, name, elapsed=0.0):
+        entry = self.operators.get(name)
+        if entry is None:
+            entry = self.operators[name] = [0, 0.0]
+
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def table(self, sort="time"):
+        line_key = self.LINE_KEYS.get(sort, self.LINE_KEYS["time"])
+        operator_key = self.OPERATOR_KEYS.get(sort, self.OPERATOR_KEYS["time"])
+
+        rows = [f"{'line':>6} {'lex ms':>10} {'parse ms':>10} {'eval ms':>10} {'total ms':>10}  source"]
+        for line in sorted(self.lines, key=line_key):
+            rows.append(f"{line.line:>6} {line.lex * 1e3:>10.3f} {line.parse * 1e3:>10.3f} {line.evaluate * 1e3:>10.3f} {line.total * 1e3:>10.3f}  {line.source.strip()}")
+
+        rows.append("")
+        rows.append(f"{'operator':<12} {'count':>10} {'cumulative ms':>14}")
+        for name, (count, elapsed) in sorted(self.operators.items(), key=operator_key):
+            rows.append(f"{name:<12} {count:>10} {elapsed * 1e3:>14.3f}")
+
+        return "\n".join(rows)
+
+    def as_dict(self):
+        return {
+            "lines": [line.as_dict() for line in self.lines],
+            "operators": {name: {"count": count, "time": elapsed} for name, (count, elapsed) in self.operators.items()}
+        }
+
+    def __repr__(self):
+        return f"(PROFILE: {len(self.lines)} lines, {sum(count for count, _ in self.operators.values())} operations)"
+
+def operator_name(node):
+    # Binary and logical operations are counted by run_chain instead
+    kind = type(node)
+    if kind is UnaryOperation:
+        return f"UNARY {TYPE_NAMES[node.operator]}"
+
+    if kind is VariableDeclaration:
+        return "DECLARE"
+
+    if kind is VariableUpdate:
+        return "UPDATE"
+
+    return None
+
+class ProfilingInterpreter(Interpreter):
+    def __init__(self, node, table, profile):
+        super().__init__(node, table)
+        self.profile = profile
+
+    def visit(self, node):
+        name = operator_name(node)
+        if name is None:
+            return PROFILED_VISITORS[type(node)](self, node)
+
+        # Operations that fail are timed and counted as well
+        start = perf_counter()
+        try:
+            return PROFILED_VISITORS[type(node)](self, node)
+        finally:
+            self.profile.count(name, perf_counter() - start)
+
+    def run_chain(self, node):
+        # Chains are always walked in a loop here, so each operation is timed
+        # from the start of the chain's bottom operand to its own result, as
+        # a nested visit would be. When one fails, it and every operation
+        # above it are counted.
+        bottom, operations = unchain(node)
+        counted = 0
+        start = perf_counter()
+        try:
+            value = self.visit(bottom)
+            for operation in operations:
+                if type(operation) is LogicalOperation:
+                    value = self.logical(operation, value)
+                else:
+                    value = self.binary(operation, value)
+
+                self.profile.count(TYPE_NAMES[operation.operator], perf_counter() - start)
+                counted += 1
+
+            return value
+        finally:
+            elapsed = perf_counter() - start
+            for operation in operations[counted:]:
+                self.profile.count(TYPE_NAMES[operation.operator], elapsed)
+
+    def run_if(self, node):
+        # Times the whole chain and counts which way it went
+        start = perf_counter()
+        try:
+            return self.run_branches(node)
+        finally:
+            self.profile.count("IF", perf_counter() - start)
+
+    def run_branches(self, node):
+        for condition_branch, value_branch in node.branches:
+            if self.visit(condition_branch):
+                self.profile.count("IF TAKEN")
+                return self.visit(value_branch)
+
+        if node.else_case is None:
+            self.profile.count("NO BRANCH")
+            return None
+
+        self.profile.count("ELSE TAKEN")
+        return self.visit(node.else_case)
+
+PROFILED_VISITORS = dict(VISITORS)
+PROFILED_VISITORS[BinaryOperation] = ProfilingInterpreter.run_chain
+PROFILED_VISITORS[LogicalOperation] = ProfilingInterpreter.run_chain
+PROFILED_VISITORS[IfChain] = ProfilingInterpreter.run_if
+
+def run_profiled(node, table, profile):
+    # The instrumented walker takes more frames per level than the engines,
+    # so it can still run out of stack on input the parser accepted. Raising
+    # the error here lets run_statement take back the line's stores.
+    try:
+        return ProfilingInterpreter(node, table, profile).run()
+    except RecursionError:
+        raise nesting_error() from None
+
+def profile_source(text, table=None):
+    table = symbol_table if table is None else table
+    profile = Profile()
+    results = []
+    outputs = []
+    for line, source in enumerate(text.split("\n"), 1):
+        if not source.strip():
+            continue
+
+        start = perf_counter()
+        lexer = Lexer(source)
+        node = error = None
+        try:
+            tokens = lexer.make_tokens()
+        except Error as exception:
+            error = exception
+
+        lexed = perf_counter()
+        if not error:
+            try:
+                node = Parser(tokens, spans=lexer.spans).generate_syntax_branch()
+            except RecursionError:
+                error = nesting_error()
+            except Error as exception:
+                error = exception
+
+        parsed = perf_counter()
+        if error:
+            res = None
+        else:
+            res, error = run_statement(lambda node, table: run_profiled(node, table, profile), node, table)
+
+        evaluated = perf_counter()
+        profile.lines.append(LineProfile(line, source, lexed - start, parsed - lexed, evaluated - parsed))
+        results.append((res, error))
+        outputs.append(output_of(node, res, error))
+
+    return results, outputs, profile
+
+def profile_file(path, table=None):
+    with open(path) as file:
+        results, outputs, profile = profile_source(file.read(), table)
+
+    for text in outputs:
+        if text is not None:
+            print(text)
+
+    return results, profile
@@ -0,0 +1,284 @@
+from .interpreter import (
+    DEFAULT_ENGINE,
+    ENGINES,
+    BinaryOperation,
+    Error,
+    IfChain,
+    Literal,
+    LogicalOperation,
+    Name,
+    Session,
+    UnaryOperation,
+    VariableDeclaration,
+    VariableError,
+    optimize,
+    output_of,
+    run_statement,
+    unchain
+)
+
+# Reactive runs
+# A variable declared from other variables keeps its declaration as a formula.
+# Whenever a statement changes a variable, every formula downstream of it is
+# evaluated again, in topological order, so derived values always follow
+# their inputs without running the rest of the program. Only top-level
+# declarations of plain variables become formulas: constants never change,
+# and a value that declares or updates variables itself would repeat those
+# side effects on every recompute. Updating a derived variable replaces its
+# formula with the new value, the way typing over a formula cell does.
+def no_reads(node, names):
+    return True
+
+def name_reads(node, names):
+    names.add(node.name)
+    return True
+
+def unary_reads(node, names):
+    return reads(node.operand, names)
+
+def binary_reads(node, names):
+    # Chains are walked in a loop, so long ones never recurse per operation
+    bottom, operations = unchain(node)
+    if not reads(bottom, names):
+        return False
+
+    for operation in operations:
+        if not reads(operation.right, names):
+            return False
+
+    return True
+
+def if_reads(node, names):
+    for condition, value in node.branches:
+        if not (reads(condition, names) and reads(value, names)):
+            return False
+
+    return node.else_case is None or reads(node.else_case, names)
+
+READERS = {
+    Literal: no_reads,
+    Name: name_reads,
+    UnaryOperation: unary_reads,
+    BinaryOperation: binary_reads,
+    LogicalOperation: binary_reads,
+    IfChain: if_reads
+}
+
+def reads(node, names):
+    # Adds every name the expression reads to names; False when the
+    # expression stores into a variable and so cannot be a formula
+    reader = READERS.get(type(node))
+    return reader is not None and reader(node, names)
+
+class Formula:
+    __slots__ = ("reads", "execute", "program")
+
+    def __init__(self, reads, execute, program):
+        self.reads = reads
+        self.execute = execute
+        self.program = program
+
+    def __repr__(self):
+        return f"(FORMULA reads {', '.join(sorted(self.reads))})"
+
+class DependencyGraph:
+    # formulas[name] is how name is computed, dependents[name] the names whose
+    # formulas read it. Recompute orders are cached per set of changed names
+    # until the graph changes.
+    def __init__(self):
+        self.formulas = {}
+        self.dependents = {}
+        self.orders = {}
+
+    def define(self, name, formula):
+        path = self.path(name, formula.reads)
+        if path is not None:
+            raise VariableError(f"Variable '{name}' would depend on itself: {' -> '.join(path)}")
+
+        self.remove(name)
+        self.orders.clear()
+        self.formulas[name] = formula
+        for read in formula.reads:
+            self.dependents.setdefault(read, set()).add(name)
+
+    def remove(self, name):
+        formula = self.formulas.pop(name, None)
+        if formula is None:
+            return None
+
+        self.orders.clear()
+        for read in formula.reads:
+            dependents = self.dependents[read]
+            dependents.discard(name)
+            if not dependents:
+                del self.dependents[read]
+
+        return formula
+
+    def path(self, name, reads):
+        # A formula for name closes a cycle when name reaches one of its own
+        # reads through the dependents; returns that cycle, starting and
+        # ending at name
+        if name in reads:
+            return [name, name]
+
+        parents = {name: None}
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            for dependent in self.dependents.get(current, ()):
+                if dependent in parents:
+                    continue
+
+                parents[dependent] = current
+                if dependent in reads:
+                    path = [name]
+                    while dependent is not None:
+                        path.append(dependent)
+                        dependent = parents[dependent]
+
+                    return path
+
+                pending.append(dependent)
+
+        return None
+
+    def order(self, changed):
+        # Every formula downstream of the changed names, each one after all
+        # of the formulas it reads (reverse post-order of a depth-first walk)
+        key = frozenset(changed)
+        order = self.orders.get(key)
+        if order is not None:
+            return order
+
+        visited = set()
+        order = []
+        for start in changed:
+            if start in visited:
+                continue
+
+            visited.add(start)
+            stack = [(start, iter(self.dependents.get(start, ())))]
+            while stack:
+                name, dependents = stack[-1]
+                for dependent in dependents:
+                    if dependent not in visited:
+                        visited.add(dependent)
+                        stack.append((dependent, iter(self.dependents.get(dependent, ()))))
+                        break
+                else:
+                    stack.pop()
+                    if name in self.formulas and name not in changed:
+                        order.append(name)
+
+        order.reverse()
+        self.orders[key] = order
+        return order
+
+    # Queries, by variable name
+    def dependencies(self, name):
+        formula = self.formulas.get(name)
+        return [] if formula is None else sorted(formula.reads)
+
+    def dependents_of(self, name):
+        return sorted(self.dependents.get(name, ()))
+
+    def affected(self, name):
+        return list(self.order([name]))
+
+    def as_dict(self):
+        return {name: self.dependencies(name) for name in self.formulas}
+
+    def __repr__(self):
+        edges = sum(len(formula.reads) for formula in self.formulas.values())
+        return f"(DEPENDENCY GRAPH: {len(self.formulas)} formulas, {edges} edges)"
+
+class ReactiveSession(Session):
+    def __init__(self, engine=DEFAULT_ENGINE, table=None):
+        super().__init__(engine, table)
+        self.graph = DependencyGraph()
+        self.recomputed = 0
+
+    def execute(self, program):
+        with self.lock:
+            compile_program, execute_program = ENGINES[program.engine]
+            def run_reactively(statement, table):
+                return self.run_statement(statement, table, compile_program, execute_program)
+
+            results = []
+            for statement in program.statements:
+                if statement.error:
+                    results.append((None, statement.error))
+                    continue
+
+                results.append(run_statement(run_reactively, statement, self.table))
+
+            return results
+
+    def run_statement(self, statement, table, compile_program, execute_program):
+        # run_statement keeps a journal while this runs, so the stores the
+        # statement made are the journal entries past the mark, and a failing
+        # recompute is undone together with the statement that caused it
+        journal = table.journal
+        mark = len(journal)
+        res = execute_program(statement.code, table)
+        changed = {table.names[slot] for slot, _, _ in journal[mark:]}
+        if not changed:
+            return res
+
+        graph = self.graph
+        previous = {name: graph.formulas.get(name) for name in changed}
+        node = statement.node
+        try:
+            for name in changed:
+                graph.remove(name)
+
+            names = set()
+            if type(node) is VariableDeclaration and not node.immutable and reads(node.value, names) and names:
+                graph.define(node.name, Formula(frozenset(names), execute_program, compile_program(optimize(node.value))))
+
+            self.propagate(changed, table)
+        except Error:
+            for name, formula in previous.items():
+                graph.remove(name)
+                if formula is not None:
+                    graph.define(name, formula)
+
+            raise
+
+        return res
+
+    def propagate(self, changed, table):
+        # A formula whose inputs all came out unchanged is skipped, and so is
+        # everything below it that nothing else changed
+        formulas = self.graph.formulas
+        values = table.values
+        dirty = set(changed)
+        for name in self.graph.order(changed):
+            formula = formulas[name]
+            if formula.reads.isdisjoint(dirty):
+                continue
+
+            slot = table.slots[name]
+            old = values[slot]
+            value = formula.execute(formula.program, table)
+            self.recomputed += 1
+            if type(value) is not type(old) or value != old:
+                table.store(slot, value, False)
+                dirty.add(name)
+
+    def __repr__(self):
+        return f"(REACTIVE SESSION {self.engine}: {self.graph!r}, {self.table!r})"
+
+def run_reactive_file(path, session=None):
+    session = ReactiveSession() if session is None else session
+    with open(path) as file:
+        program = session.compile(file.read())
+
+    results = session.execute(program)
+    for statement, (res, error) in zip(program.statements, results):
+        text = output_of(statement.node, res, error)
+        if text is not None:
+            print(text)
+
+    return results
@@ -0,0 +1,155 @@
+import json
+import os
+import socket
+import stat
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+
+from .interpreter import DEFAULT_ENGINE, Session, output_of, to_text
+
+# Every frame is a 4-byte big-endian length followed by that many bytes of
+# JSON. A request is {"source": text} or {"path": file}; the reply is
+# {"results": [{"line", "value", "output", "error", "span"}, ...]} or
+# {"error": text}. value is the statement's value as the language prints it
+# (JSON cannot hold every number, such as ints past 4300 digits or Decimals),
+# or null when the statement failed; span is the [start, end) columns of the
+# line that a failed statement's error points at, or null
+HEADER_SIZE = 4
+MAX_FRAME = 64 * 1024 * 1024
+
+def encode_frame(payload):
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return len(data).to_bytes(HEADER_SIZE, "big") + data
+
+def read_frame(file):
+    header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        return None
+    
+    length = int.from_bytes(header, "big")
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes is larger than {MAX_FRAME}")
+    
+    data = file.read(length)
+    if len(data) < length:
+        return None
+    
+    return json.loads(data)
+
+def respond(session, request):
+    if not isinstance(request, dict):
+        return {"error": "ProtocolError: Expected an object"}
+    
+    for key in ("source", "path"):
+        if key in request and not isinstance(request[key], str):
+            return {"error": f"ProtocolError: Expected '{key}' to be a string"}
+    
+    if "source" in request:
+        text = request["source"]
+    elif "path" in request:
+        try:
+            with open(request["path"]) as file:
+                text = file.read()
+        except OSError as error:
+            return {"error": f"FileError: {error.strerror}"}
+        except UnicodeDecodeError:
+            return {"error": "FileError: File is not valid text"}
+    else:
+        return {"error": "ProtocolError: Expected 'source' or 'path'"}
+    
+    program = session.compile(text)
+    results = []
+    for statement, (res, error) in zip(program.statements, session.execute(program)):
+        results.append({
+            "line": statement.line,
+            "value": None if error else to_text(res),
+            "output": output_of(statement.node, res, error),
+            "error": error.as_string() if error else None,
+            "span": error.span if error else None
+        })
+    
+    return {"results": results}
+
+class Handler(StreamRequestHandler):
+    def handle(self):
+        # One session per connection: a client keeps its variables between
+        # requests and never sees another client's
+        session = Session(self.server.engine)
+        while True:
+            try:
+                request = read_frame(self.rfile)
+            except ValueError as error:
+                self.wfile.write(encode_frame({"error": f"ProtocolError: {error}"}))
+                return
+            
+            if request is None:
+                return
+            
+            self.wfile.write(encode_frame(respond(session, request)))
+
+def remove_stale_socket(path):
+    # Only a socket nobody answers on is left over from an earlier daemon;
+    # anything else at the path belongs to someone and is never removed
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    
+    raise FileExistsError(f"A daemon is already listening on {path}")
+
+class Server(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, engine=DEFAULT_ENGINE):
+        self.engine = engine
+        remove_stale_socket(path)
+        super().__init__(path, Handler)
+    
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+def serve(path, engine=DEFAULT_ENGINE):
+    with Server(path, engine) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+class Client:
+    def __init__(self, path):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile("rb")
+    
+    def request(self, payload):
+        self.socket.sendall(encode_frame(payload))
+        return read_frame(self.file)
+    
+    def run(self, source):
+        return self.request({"source": source})
+    
+    def run_file(self, path):
+        return self.request({"path": os.path.abspath(path)})
+    
+    def close(self):
+        self.file.close()
+        self.socket.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
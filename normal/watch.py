@@ -0,0 +1,124 @@
+import os
+import time
+
+from .interpreter import DEFAULT_ENGINE, ENGINES, Statement, SymbolTable, output_of, program_cache, run_statement
+
+# Incremental runs
+# Execution is deterministic and a line only sees the lines above it, so after
+# an edit every statement before the first changed one would give the same
+# result again. Those results are kept, the table is put back the way it was
+# just before the first changed statement and only the rest runs again. Each
+# distinct line is lexed and parsed once for as long as it stays in the file.
+class IncrementalRun:
+    def __init__(self, engine=DEFAULT_ENGINE):
+        self.engine = engine
+        self.table = SymbolTable()
+        self.statements = []
+        self.results = []
+        # checkpoints[index] is a snapshot of the table just before
+        # statements[index] ran
+        self.checkpoints = []
+        self.compiled = {}
+        self.reparsed = 0
+        self.executed = 0
+    
+    def compile(self, source, compiled):
+        entry = self.compiled.get(source)
+        if entry is None:
+            entry = compiled.get(source)
+        
+        if entry is None:
+            node, code, error = program_cache.get(source, self.engine)
+            entry = (node, code, error)
+            self.reparsed += 1
+        
+        compiled[source] = entry
+        return entry
+    
+    def update(self, text):
+        self.reparsed = 0
+        compiled = {}
+        statements = []
+        for line, source in enumerate(text.split("\n"), 1):
+            if source.strip():
+                statements.append(Statement(line, source, *self.compile(source, compiled)))
+        
+        self.compiled = compiled
+        first = 0
+        limit = min(len(statements), len(self.statements))
+        while first < limit and statements[first].source == self.statements[first].source:
+            first += 1
+        
+        if first < len(self.checkpoints):
+            self.table.restore(self.checkpoints[first])
+        
+        del self.results[first:]
+        del self.checkpoints[first:]
+        self.statements = statements
+
+        execute_program = ENGINES[self.engine][1]
+        for statement in statements[first:]:
+            self.checkpoints.append(self.table.snapshot())
+            if statement.error:
+                self.results.append((None, statement.error))
+            else:
+                self.results.append(run_statement(execute_program, statement.code, self.table))
+        
+        self.executed = len(statements) - first
+        return first
+    
+    def outputs(self):
+        texts = []
+        for statement, (res, error) in zip(self.statements, self.results):
+            text = output_of(statement.node, res, error)
+            if text is not None:
+                texts.append(text)
+        
+        return texts
+
+class FileWatch:
+    # Polls one file and runs it again whenever it changes. A file that
+    # cannot be read is reported once, not on every poll, and runs again as
+    # soon as it can be read
+    def __init__(self, path, engine=DEFAULT_ENGINE):
+        self.path = path
+        self.run = IncrementalRun(engine)
+        self.modified = None
+        self.reported = None
+    
+    def poll(self):
+        start = time.perf_counter()
+        try:
+            stamp = os.stat(self.path).st_mtime_ns
+            if stamp == self.modified:
+                return False
+            
+            # The file can go away between the stat and the open
+            with open(self.path) as file:
+                text = file.read()
+        except OSError as error:
+            self.modified = None
+            message = f"FileError: {error.strerror}"
+            if message != self.reported:
+                self.reported = message
+                print(message, flush=True)
+            
+            return False
+        
+        self.modified = stamp
+        self.reported = None
+        run = self.run
+        first = run.update(text)
+        elapsed = time.perf_counter() - start
+        print(f"==> {self.path} <==")
+        for text in run.outputs():
+            print(text)
+        
+        print(f"-- {len(run.statements)} statements, reparsed {run.reparsed}, ran {run.executed} from statement {first + 1}, {elapsed * 1000:.2f} ms", flush=True)
+        return True
+
+def watch(path, engine=DEFAULT_ENGINE, interval=0.5):
+    file_watch = FileWatch(path, engine)
+    while True:
+        file_watch.poll()
+        time.sleep(interval)
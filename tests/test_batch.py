@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from normal.__main__ import main
+from normal.batch import expand, run_many
+
+FILES = {
+    "a.normal": "let x be 1\nx + 1",
+    "b.normal": "let x be 2\n1 / 0\nx",
+    "c.normal": "x",
+    os.path.join("sub", "d.normal"): "let x be 5\nx * 2",
+    "notes.txt": "not a program"
+}
+
+@pytest.fixture
+def tree(tmp_path):
+    for name, text in FILES.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(text)
+
+    return str(tmp_path)
+
+@pytest.fixture(params=[1, 2])
+def workers(request):
+    return request.param
+
+def test_expand(tree):
+    def names(paths):
+        return [os.path.relpath(path, tree) for path in paths]
+
+    assert names(expand([tree])) == ["a.normal", "b.normal", "c.normal", os.path.join("sub", "d.normal")]
+    assert names(expand([os.path.join(tree, "*.normal")])) == ["a.normal", "b.normal", "c.normal"]
+    assert names(expand([os.path.join(tree, "**", "d.normal"), os.path.join(tree, "a.normal")])) == [os.path.join("sub", "d.normal"), "a.normal"]
+    # A name that matches nothing is kept, so running it reports the error
+    assert names(expand([os.path.join(tree, "missing.normal")])) == ["missing.normal"]
+
+def test_run_many(tree, workers):
+    paths = expand([tree]) + [os.path.join(tree, "missing.normal")]
+    results = list(run_many(paths, workers=workers))
+    assert [result.path for result in results] == paths
+    # Every file runs in a fresh session
+    assert [result.output for result in results] == [
+        ["1", "2"],
+        ["2", "MathError: Cannot divide 1 to 0", "2"],
+        ["VariableError: Variable 'x' is not defined"],
+        ["5", "10"],
+        ["FileError: No such file or directory"]
+    ]
+    assert [result.statements for result in results] == [2, 3, 1, 2, 0]
+    assert [result.errors for result in results] == [0, 1, 1, 0, 1]
+    assert [result.failed for result in results] == [False, True, True, False, True]
+    assert [result.size for result in results] == [len(FILES[os.path.relpath(path, tree)]) for path in paths[:4]] + [0]
+
+def test_fail_fast(tree, workers):
+    paths = expand([tree])
+    results = list(run_many(paths, workers=workers, fail_fast=True))
+    assert [result.path for result in results] == paths[:2]
+
+def test_run_many_command(tree, workers, capsys):
+    assert main(["run-many", "--fail-fast", "--workers", str(workers), tree]) == 1
+    lines = capsys.readouterr().out.split("\n")
+    assert [line for line in lines if line.startswith("==>")] == [f"==> {os.path.join(tree, name)} <==" for name in ("a.normal", "b.normal")]
+    assert lines[-2].startswith("2 files, 5 statements, 1 failed in ")
+
+    assert main(["run-many", "--workers", str(workers), os.path.join(tree, "sub")]) == 0
+    lines = capsys.readouterr().out.split("\n")
+    assert lines[:3] == [f"==> {os.path.join(tree, 'sub', 'd.normal')} <==", "5", "10"]
@@ -0,0 +1,163 @@
+import random
+
+import pytest
+
+from normal import SymbolTable, compile_source, evaluate_columns, execute
+from normal.watch import IncrementalRun
+
+# Random programs run on every engine (or evaluator) and are compared with the
+# tree walker. Seeds are fixed, so a failure always reproduces.
+ATOMS = ["0", "1", "2", "3", "0.5", "2.25", "1e30", "true", "false", "null", "x", "y", "z"]
+OPERATORS = ["and", "or", "+", "-", "*", "/", "^", "==", "!=", ">", ">=", "<", "<="]
+JUNK = ["", "", "", "", " $", " )", " (", " let", " +", " ==", " =", " 1.2.3", " ."]
+
+def expression(generator, depth):
+    if depth == 0 or generator.random() < 0.3:
+        return generator.choice(ATOMS)
+
+    roll = generator.random()
+    if roll < 0.1:
+        return f"-({expression(generator, depth - 1)})"
+
+    if roll < 0.2:
+        return f"(not {expression(generator, depth - 1)})"
+
+    if roll < 0.25:
+        return f"(if {expression(generator, depth - 1)}: {expression(generator, depth - 1)} else: {expression(generator, depth - 1)})"
+
+    return f"({expression(generator, depth - 1)} {generator.choice(OPERATORS)} {expression(generator, depth - 1)})"
+
+def statement(generator, junk=True):
+    roll = generator.random()
+    name = generator.choice("xyzw")
+    if roll < 0.2:
+        text = f"let {name} be {expression(generator, 3)}"
+    elif roll < 0.3:
+        text = f"constant {name} is {expression(generator, 3)}"
+    elif roll < 0.45:
+        text = f"{name} is now {expression(generator, 3)}"
+    elif roll < 0.6:
+        text = f"if {expression(generator, 2)}: {name} is now {expression(generator, 2)} else if {expression(generator, 2)}: {expression(generator, 2)} else: {expression(generator, 2)}"
+    else:
+        text = expression(generator, 3)
+
+    return text + (generator.choice(JUNK) if junk else "")
+
+def results(source, engine, table):
+    return [(repr(res), type(res), error and error.as_string()) for res, error in execute(compile_source(source, engine), table)]
+
+@pytest.mark.parametrize("engine", ["vm", "closure"])
+@pytest.mark.parametrize("seed", range(4))
+def test_engines_agree(engine, seed):
+    generator = random.Random(seed)
+    for _ in range(60):
+        source = "\n".join(statement(generator) for _ in range(generator.randint(1, 6)))
+        expected = SymbolTable()
+        got = SymbolTable()
+        # Run twice, so the second run reuses the cached programs
+        for _ in range(2):
+            assert results(source, engine, got) == results(source, "tree", expected), source
+
+        assert repr(got) == repr(expected), source
+
+def arithmetic(generator, depth):
+    if depth == 0 or generator.random() < 0.2:
+        return generator.choice(["x", "y", "z", "x", "y", "z", "1", "2", "0.5"])
+
+    operator = generator.choice(["+", "-", "*", "==", "!=", ">", ">=", "<", "<=", "+", "-", "*"])
+    return f"({arithmetic(generator, depth - 1)} {operator} {arithmetic(generator, depth - 1)})"
+
+@pytest.mark.parametrize("seed", range(4))
+def test_vm_fast_paths_agree(seed):
+    # The same program keeps running while its operand types change, so the
+    # VM's int fast paths and the generic operations both see every operator
+    generator = random.Random(seed)
+    groups = [["1", "0", "2", "-2"], ["2.5", "0.5", "-1.25"], ["true", "false"]]
+    for _ in range(40):
+        source = arithmetic(generator, 3)
+        kinds = {name: generator.choice(groups) for name in "xyz"}
+        tables = {"tree": SymbolTable(), "vm": SymbolTable()}
+        for run in range(12):
+            if run == 8:
+                kinds = {name: generator.choice(groups + [groups[0] + groups[1] + ["null"]]) for name in "xyz"}
+
+            verb = "let {} be {}" if run == 0 else "{} is now {}"
+            setup = "\n".join(verb.format(name, generator.choice(kinds[name])) for name in "xyz")
+            for engine, table in tables.items():
+                execute(compile_source(setup, engine), table)
+
+            assert results(source, "vm", tables["vm"]) == results(source, "tree", tables["tree"]), source
+
+def test_token_soup_never_crashes():
+    generator = random.Random(0)
+    tokens = ["1", "2", "0", "3.5", "-", "+", "*", "/", "^", "(", ")", "==", ">", "<=", "and", "or", "not",
+              "true", "null", "a", "b", "if", ":", "else", "is", "now", "let", "be", "constant", "x"]
+    for _ in range(400):
+        source = "let a be 2\nlet b be 0.5\n" + "\n".join(" ".join(generator.choice(tokens) for _ in range(generator.randint(1, 10))) for _ in range(4))
+        expected = results(source, "tree", SymbolTable())
+        for engine in ("vm", "closure"):
+            assert results(source, engine, SymbolTable()) == expected, source
+
+@pytest.mark.parametrize("seed", range(3))
+def test_columns_match_rows(seed):
+    generator = random.Random(seed)
+    values = [0, 1, 2, -3, 2.5, 0.5, True, False, None, 100]
+    rows = 20
+    for _ in range(40):
+        source = "\n".join(statement(generator, junk=False) for _ in range(generator.randint(1, 6)))
+        columns = {name: [generator.choice(values) for _ in range(rows)] for name in "xy"}
+        got = evaluate_columns(source, columns)
+        for row in range(rows):
+            table = SymbolTable()
+            for name, column in columns.items():
+                table.declare(name, column[row], False)
+
+            expected = execute(compile_source(source, "tree"), table)
+            for index, (res, error) in enumerate(expected):
+                values_column, errors_column = got.results[index]
+                error_text = errors_column[row] and errors_column[row].as_string()
+                assert (repr(values_column[row]), error_text) == (repr(res), error and error.as_string()), (source, row)
+
+def test_columns_long_chains():
+    # Far longer than the recursion limit
+    terms = 10 ** 4
+    source = " + ".join(["x"] * terms) + "\n" + " and ".join(["x > 0"] * terms)
+    got = evaluate_columns(source, {"x": [1, 2, None]})
+    assert got.results[0][0][:2] == [terms, 2 * terms]
+    assert got.results[1][0][:2] == [True, True]
+    assert [error and error.as_string() for error in got.errors()] == [None, None, "TypeError: Expected number, got null"]
+
+@pytest.mark.parametrize("engine", ["tree", "vm", "closure"])
+def test_watch_matches_full_runs(engine):
+    generator = random.Random(engine)
+    names = "abcd"
+
+    def line():
+        name = generator.choice(names)
+        other = generator.choice(names)
+        return generator.choice([
+            f"let {name} be {generator.randint(0, 5)}",
+            f"constant {name} is {other} + 1",
+            f"{name} is now {other} * 2 - {generator.randint(0, 3)}",
+            f"{name} / ({other} - 2)",
+            f"if {name} > {other}: {name} is now {other} else: {other} + 1",
+            "",
+            f"{name} + {other}"
+        ])
+
+    for _ in range(60):
+        run = IncrementalRun(engine)
+        lines = [line() for _ in range(generator.randint(1, 15))]
+        for _ in range(8):
+            text = "\n".join(lines)
+            run.update(text)
+            full = execute(compile_source(text, engine), SymbolTable())
+            assert [(repr(res), error and error.as_string()) for res, error in run.results] == [(repr(res), error and error.as_string()) for res, error in full], text
+
+            roll = generator.random()
+            if roll < 0.4 and lines:
+                lines[generator.randrange(len(lines))] = line()
+            elif roll < 0.7:
+                lines.insert(generator.randint(0, len(lines)), line())
+            elif lines:
+                del lines[generator.randrange(len(lines))]
@@ -0,0 +1,228 @@
+import os
+
+import pytest
+
+from normal import ENGINES, SymbolTable, compile_source, execute, output_of, set_decimal_mode, to_text
+from normal.__main__ import main
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "normal", "main.normal")
+
+def outputs(source, engine, table=None):
+    program = compile_source(source, engine)
+    results = execute(program, SymbolTable() if table is None else table)
+    texts = []
+    for statement, (res, error) in zip(program.statements, results):
+        text = output_of(statement.node, res, error)
+        if text is not None:
+            texts.append(text)
+
+    return texts
+
+@pytest.fixture(params=sorted(ENGINES))
+def engine(request):
+    return request.param
+
+def test_main_program(engine):
+    with open(MAIN) as file:
+        assert outputs(file.read(), engine) == ["2", "5"]
+
+def test_arithmetic(engine):
+    assert outputs("1 + 2 * 3\n7 / 2\n2 ^ 10\n-(3 - 5)\n0.1 + 0.2\n3 - 1.5", engine) == ["7", "3.5", "1024", "2", "0.30000000000000004", "1.5"]
+
+def test_error_messages(engine):
+    source = "\n".join([
+        "let y be 1 +",
+        "let x be 2",
+        "x / 0",
+        "q + 1",
+        "x is now 3",
+        "constant c is 1",
+        "c is now 2",
+        "let x be 5",
+        "1 + 2 $",
+        "null + x"
+    ])
+    assert outputs(source, engine) == [
+        "SyntaxError: Too few numbers to perform addition, got 1/2",
+        "2",
+        "MathError: Cannot divide 2 to 0",
+        "VariableError: Variable 'q' is not defined",
+        "3",
+        "1",
+        "VariableError: Variable 'c' cannot be changed",
+        "SyntaxError: There is already a declaration with the name 'x'",
+        "SyntaxError: Unexpected character: '$'",
+        "TypeError: Expected number, got null"
+    ]
+
+def test_short_circuit(engine):
+    source = "\n".join([
+        "false and missing",
+        "true or missing",
+        "if true: 1 else: missing",
+        "if false: missing else if true: 2 else: missing",
+        "true and missing"
+    ])
+    assert outputs(source, engine) == ["false", "true", "1", "2", "VariableError: Variable 'missing' is not defined"]
+
+def test_short_circuit_skips_stores(engine):
+    table = SymbolTable()
+    outputs("let x be 1\nfalse and (x is now 2)\ntrue or (x is now 3)\nif false: x is now 4", engine, table)
+    assert table.get("x") == 1
+
+def test_declaration_errors(engine):
+    source = "\n".join([
+        "let x be 1",
+        "let x be 2",
+        "y is now 1",
+        "constant c is 3",
+        "c is now 4",
+        "constant c is 5",
+        "let c be 6",
+        "x"
+    ])
+    assert outputs(source, engine) == [
+        "1",
+        "SyntaxError: There is already a declaration with the name 'x'",
+        "SyntaxError: There are not any variable declaration with the name 'y'",
+        "3",
+        "VariableError: Variable 'c' cannot be changed",
+        "VariableError: Variable 'c' cannot be changed",
+        "SyntaxError: There is already a declaration with the name 'c'",
+        "1"
+    ]
+
+def test_null_comparison(engine):
+    assert outputs("(null == 1) == false\nnull == null\nnull != 0", engine) == ["true", "true", "true"]
+
+def test_failed_statement_is_atomic(engine):
+    table = SymbolTable()
+    assert outputs("let x be 1\n(if true: x is now 5 else: 0) + null\nx", engine, table) == ["1", "TypeError: Expected number, got null", "1"]
+
+def test_error_spans(engine):
+    program = compile_source("let x be 2\nx + (1 / 0)\nx + missing\nmissing * 2\nx / 0", engine)
+    results = execute(program, SymbolTable())
+    assert results[1][1].span == (7, 8)
+    assert results[2][1].span == (4, 11)
+    assert results[3][1].span == (0, 7)
+    assert results[4][1].span == (2, 3)
+
+def test_operands_that_are_not_ints(engine):
+    # The VM inlines operations on two ints; anything else has to reach the
+    # full operation, and a failure has to end the statement
+    source = "\n".join([
+        "let f be 2.5",
+        "f * 2 + 1",
+        "(f > 1) + 1",
+        "let n be null",
+        "n * 2 + 1",
+        "1 + n * 2",
+        "n > 1 or true",
+        "n == null and f * 2 > 4"
+    ])
+    assert outputs(source, engine) == [
+        "2.5",
+        "6",
+        "2",
+        "null",
+        "TypeError: Expected number, got null",
+        "TypeError: Expected number, got null",
+        "TypeError: Expected number, got null",
+        "true"
+    ]
+
+def test_tables_only_hold_their_own_names(engine):
+    outputs("\n".join(f"let other{index} be {index}" for index in range(1000)), engine)
+    table = SymbolTable()
+    assert outputs("let a be 1\na + 1", engine, table) == ["1", "2"]
+    assert table.names == ["a"]
+
+def test_programs_run_against_several_tables(engine):
+    # The tables give x and y different slots, and the program alternates
+    # between them
+    program = compile_source("x is now x + y", engine)
+    first = SymbolTable()
+    outputs("let x be 1\nlet y be 10", engine, first)
+    second = SymbolTable()
+    outputs("let y be 20\nlet x be 2", engine, second)
+    for _ in range(2):
+        execute(program, first)
+        execute(program, second)
+
+    assert (first.get("x"), second.get("x")) == (21, 42)
+    assert execute(program, SymbolTable())[0][1].as_string() == "VariableError: Variable 'x' is not defined"
+
+def test_long_chains(engine):
+    # Far longer than the recursion limit, so no pass may recurse per operation
+    terms = 10 ** 4
+    source = "\n".join([
+        "let x be 1",
+        " + ".join(["x"] * terms),
+        " + ".join(["1"] * terms),
+        " - ".join(f"x * {index}" for index in range(terms)),
+        " and ".join(["x > 0"] * terms),
+        " or ".join(["false"] * terms) + " or x",
+        "x is now " + " + ".join(["x"] * terms) + " + missing",
+        "x"
+    ])
+    assert outputs(source, engine) == [
+        "1",
+        str(terms),
+        str(terms),
+        str(-sum(range(terms))),
+        "true",
+        "true",
+        "VariableError: Variable 'missing' is not defined",
+        "1"
+    ]
+
+def test_nesting_limit(engine):
+    # Nesting is bounded in the parser, so deep input is a syntax error and
+    # never a RecursionError in a later pass
+    assert outputs("(" * 40 + "1" + ")" * 40 + "\n" + "not " * 40 + "true", engine) == ["1", "true"]
+    assert outputs("(if true: " * 30 + "1" + " else: 0)" * 30, engine) == ["1"]
+    error = "SyntaxError: Expression is nested too deeply"
+    assert outputs("(" * 1000 + "1" + ")" * 1000, engine) == [error]
+    assert outputs("not " * 1000 + "true", engine) == [error]
+    assert outputs("2 ^ (" * 1000 + "1" + ")" * 1000, engine) == [error]
+
+def test_products_stay_bounded(engine):
+    texts = outputs("let a be 3 ^ 400000\nlet b be a * a * a\n(if true: a else: 0) * a\na * 2 > a", engine)
+    assert texts[1] == "MathError: Result of 3.176053906263896e+190848 * 3.176053906263896e+190848 is too large"
+    assert texts[2] == texts[1]
+    assert texts[3] == "true"
+
+def test_powers_of_two_up_to_the_limit(engine):
+    texts = outputs("2 ^ 1000000 > 0\n2 ^ 1048575 > 0\n2 ^ 1048576\nlet e be 1000000\n2 ^ e > 0\n3 ^ 1048576", engine)
+    assert texts[:2] == ["true", "true"]
+    assert texts[2].startswith("MathError: Result of 2 ^ 1048576 is too large")
+    assert texts[3:5] == ["1000000", "true"]
+    assert texts[5].startswith("MathError")
+
+def test_decimal_flag(tmp_path, capsys):
+    path = tmp_path / "sum.normal"
+    path.write_text("0.1 + 0.2\n1 / 3")
+    try:
+        main(["--decimal", str(path)])
+        assert capsys.readouterr().out.split() == ["0.3", "0.3333333333333333333333333333"]
+        main(["--decimal-precision", "5", str(path)])
+        assert capsys.readouterr().out.split() == ["0.3", "0.33333"]
+    finally:
+        set_decimal_mode(False, 28)
+
+def test_large_int_text():
+    # Scientific notation, to the same digits Decimal gives
+    assert to_text(2 ** 20000) == "3.980276840337967e+6020"
+    assert to_text(-(10 ** 5000)) == "-1.000000000000000e+5000"
+    assert to_text(3 ** 400000) == "3.176053906263896e+190848"
+
+def test_error_classes_keep_python_names_free():
+    import builtins
+    import normal
+
+    namespace = {}
+    exec("from normal import *", namespace)
+    assert "SyntaxError" not in namespace and "TypeError" not in namespace
+    assert not issubclass(builtins.TypeError, normal.Error)
+    assert normal.NormalTypeError.error == "TypeError"
+    assert normal.NormalSyntaxError.error == "SyntaxError"
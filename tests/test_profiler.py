@@ -0,0 +1,109 @@
+import json
+
+from normal import SymbolTable, profile_source
+from normal.profiler import ProfilingInterpreter
+
+SOURCE = "\n".join([
+    "let x be 2",
+    "x * 3 + 1 - x",
+    "if x > 5: 1 else: 0",
+    "if x < 5: 1",
+    "if x > 5: 1",
+    "",
+    "x > 1 and x < 3 or false",
+    "-x",
+    "x is now x + 1",
+    "missing + 1"
+])
+
+def counts(profile):
+    return {name: count for name, (count, _) in profile.operators.items()}
+
+def test_outputs_and_counts():
+    results, outputs, profile = profile_source(SOURCE, SymbolTable())
+    assert outputs == ["2", "5", "0", "1", None, "true", "-2", "3", "VariableError: Variable 'missing' is not defined"]
+    assert results[-1][1] is not None
+    # Blank lines are skipped, and a failed operation is still counted
+    assert [line.line for line in profile.lines] == [1, 2, 3, 4, 5, 7, 8, 9, 10]
+    assert counts(profile) == {
+        "DECLARE": 1,
+        "MUL": 1,
+        "PLUS": 3,
+        "MINUS": 1,
+        "GT": 3,
+        "ST": 2,
+        "AND": 1,
+        "OR": 1,
+        "UNARY MINUS": 1,
+        "UPDATE": 1,
+        "IF": 3,
+        "IF TAKEN": 1,
+        "ELSE TAKEN": 1,
+        "NO BRANCH": 1
+    }
+
+def test_failed_lines_are_profiled():
+    _, outputs, profile = profile_source("1 +\n" + "(" * 1000 + "1" + ")" * 1000, SymbolTable())
+    assert outputs == ["SyntaxError: Too few numbers to perform addition, got 1/2", "SyntaxError: Expression is nested too deeply"]
+    assert len(profile.lines) == 2
+    assert profile.operators == {}
+
+def test_running_out_of_stack(monkeypatch):
+    def run(self):
+        self.table.assign("x", 5)
+        raise RecursionError
+
+    table = SymbolTable()
+    profile_source("let x be 1", table)
+    monkeypatch.setattr(ProfilingInterpreter, "run", run)
+    results, outputs, _ = profile_source("x is now 2", table)
+    assert outputs == ["SyntaxError: Expression is nested too deeply"]
+    # The line is rolled back like any other failed statement
+    assert table.get("x") == 1
+
+def test_table_sorting():
+    _, _, profile = profile_source(SOURCE, SymbolTable())
+    profile.operators["PLUS"][1] = 10.0
+    profile.operators["MUL"][1] = 20.0
+    profile.lines[2].evaluate = 5.0
+    profile.lines[4].lex = 4.0
+
+    def sections(sort):
+        rows = profile.table(sort).split("\n")
+        blank = rows.index("")
+        lines = [int(row.split()[0]) for row in rows[1:blank]]
+        operators = [row[:12].strip() for row in rows[blank + 2:]]
+        return lines, operators
+
+    lines, operators = sections("time")
+    assert lines[:2] == [3, 5]
+    assert operators[:2] == ["MUL", "PLUS"]
+
+    lines, operators = sections("count")
+    assert operators[:2] == ["PLUS", "GT"]
+
+    lines, operators = sections("name")
+    assert operators == sorted(operators)
+
+    lines, _ = sections("line")
+    assert lines == [1, 2, 3, 4, 5, 7, 8, 9, 10]
+
+    lines, _ = sections("lex")
+    assert lines[0] == 5
+
+    lines, _ = sections("evaluate")
+    assert lines[0] == 3
+
+def test_json_shape():
+    _, _, profile = profile_source("let x be 1\nx + 1", SymbolTable())
+    data = json.loads(json.dumps(profile.as_dict()))
+    assert set(data) == {"lines", "operators"}
+    assert [line["line"] for line in data["lines"]] == [1, 2]
+    assert [line["source"] for line in data["lines"]] == ["let x be 1", "x + 1"]
+    for line in data["lines"]:
+        assert set(line) == {"line", "source", "lex", "parse", "evaluate", "total"}
+        assert line["total"] == line["lex"] + line["parse"] + line["evaluate"]
+
+    assert set(data["operators"]) == {"DECLARE", "PLUS"}
+    assert data["operators"]["PLUS"]["count"] == 1
+    assert set(data["operators"]["PLUS"]) == {"count", "time"}
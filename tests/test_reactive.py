@@ -0,0 +1,110 @@
+import pytest
+
+from normal import ENGINES, DependencyGraph, ReactiveSession
+from normal.interpreter import VariableError
+from normal.reactive import Formula
+
+@pytest.fixture(params=sorted(ENGINES))
+def session(request):
+    return ReactiveSession(request.param)
+
+def run(session, source):
+    return session.execute(session.compile(source))
+
+def values(session, *names):
+    return [session.table.get(name) for name in names]
+
+DIAMOND = "\n".join([
+    "let a be 1",
+    "let b be a + 1",
+    "let c be a * 2",
+    "let d be b + c"
+])
+
+def test_diamond(session):
+    run(session, DIAMOND)
+    assert values(session, "b", "c", "d") == [2, 2, 4]
+
+    order = session.graph.affected("a")
+    assert sorted(order) == ["b", "c", "d"]
+    assert order[-1] == "d"
+
+    recomputed = session.recomputed
+    run(session, "a is now 5")
+    assert values(session, "b", "c", "d") == [6, 10, 16]
+    # d is recomputed once, after both of its inputs
+    assert session.recomputed - recomputed == 3
+
+def test_unchanged_formulas_are_skipped(session):
+    run(session, "let a be 1\nlet positive be a > 0\nlet sign be if positive: 1 else: -1\nlet twice be sign * 2")
+    recomputed = session.recomputed
+    run(session, "a is now 7")
+    # positive stays true, so nothing below it runs again
+    assert session.recomputed - recomputed == 1
+    assert values(session, "positive", "sign", "twice") == [True, 1, 2]
+
+    run(session, "a is now -3")
+    assert session.recomputed - recomputed == 4
+    assert values(session, "positive", "sign", "twice") == [False, -1, -2]
+
+def test_failed_recompute_rolls_back(session):
+    run(session, "let a be 1\nlet b be a * 10\nlet c be 100 / b")
+    results = run(session, "b is now 0")
+    assert results[0][1].as_string() == "MathError: Cannot divide 100 to 0"
+    # The update and the recompute are both undone, and b keeps its formula
+    assert values(session, "a", "b", "c") == [1, 10, 10]
+    assert session.graph.dependencies("b") == ["a"]
+    assert session.graph.dependents_of("b") == ["c"]
+
+    run(session, "a is now 2")
+    assert values(session, "b", "c") == [20, 5]
+
+def test_updates_replace_formulas(session):
+    run(session, "let a be 1\nlet b be a + 1\nlet c be b * 3")
+    run(session, "b is now 5")
+    assert values(session, "b", "c") == [5, 15]
+    assert session.graph.dependencies("b") == []
+    assert session.graph.affected("a") == []
+
+    run(session, "a is now 10")
+    assert values(session, "b", "c") == [5, 15]
+    run(session, "b is now b + 1")
+    assert values(session, "b", "c") == [6, 18]
+
+def test_long_chains(session):
+    run(session, "let a be 1\nlet b be " + " + ".join(["a"] * 10 ** 4))
+    run(session, "a is now 2")
+    assert values(session, "b") == [2 * 10 ** 4]
+
+def formula(*reads):
+    return Formula(frozenset(reads), None, None)
+
+def test_cycles():
+    graph = DependencyGraph()
+    with pytest.raises(VariableError) as error:
+        graph.define("a", formula("a"))
+    assert error.value.as_string() == "VariableError: Variable 'a' would depend on itself: a -> a"
+
+    graph.define("a", formula("b"))
+    graph.define("b", formula("c"))
+    with pytest.raises(VariableError) as error:
+        graph.define("c", formula("a", "x"))
+    assert error.value.as_string() == "VariableError: Variable 'c' would depend on itself: c -> a -> b -> c"
+
+    # The failed definition leaves the graph as it was
+    assert graph.as_dict() == {"a": ["b"], "b": ["c"]}
+    graph.define("c", formula("x"))
+    assert graph.affected("x") == ["c", "b", "a"]
+
+def test_queries(session):
+    run(session, DIAMOND + "\nlet e be 3")
+    graph = session.graph
+    assert graph.dependencies("d") == ["b", "c"]
+    assert graph.dependencies("a") == []
+    assert graph.dependencies("e") == []
+    assert graph.dependents_of("a") == ["b", "c"]
+    assert graph.dependents_of("d") == []
+    assert graph.affected("b") == ["d"]
+    assert graph.affected("e") == []
+    assert graph.as_dict() == {"b": ["a"], "c": ["a"], "d": ["b", "c"]}
+    assert repr(graph) == "(DEPENDENCY GRAPH: 3 formulas, 4 edges)"
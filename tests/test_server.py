@@ -0,0 +1,82 @@
+import os
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from normal import set_decimal_mode
+from normal.server import Client, Server
+
+@pytest.fixture
+def directory():
+    # Unix socket paths are limited to about 100 bytes, so stay short
+    with tempfile.TemporaryDirectory(dir="/tmp") as path:
+        yield path
+
+@pytest.fixture
+def daemon(directory):
+    path = os.path.join(directory, "normal.sock")
+    server = Server(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+def test_results(daemon):
+    with Client(daemon) as client:
+        reply = client.run("let x be 2\nx / 0\nx * 3")
+
+    assert reply["results"] == [
+        {"line": 1, "value": "2", "output": "2", "error": None, "span": None},
+        {"line": 2, "value": None, "output": "MathError: Cannot divide 2 to 0", "error": "MathError: Cannot divide 2 to 0", "span": [2, 3]},
+        {"line": 3, "value": "6", "output": "6", "error": None, "span": None}
+    ]
+
+def test_values_json_cannot_hold(daemon):
+    with Client(daemon) as client:
+        reply = client.run("2 ^ 20000")
+        assert reply["results"][0]["value"].startswith("3.98")
+
+        set_decimal_mode(True)
+        try:
+            reply = client.run("1 / 3")
+        finally:
+            set_decimal_mode(False)
+
+        assert reply["results"][0]["value"] == "0.3333333333333333333333333333"
+
+def test_sources_must_be_strings(daemon):
+    with Client(daemon) as client:
+        assert client.request({"source": 5}) == {"error": "ProtocolError: Expected 'source' to be a string"}
+        assert client.request({"path": ["a"]}) == {"error": "ProtocolError: Expected 'path' to be a string"}
+        # The connection is still usable
+        assert client.run("1 + 1")["results"][0]["value"] == "2"
+
+def test_never_replaces_a_file(directory):
+    path = os.path.join(directory, "main.normal")
+    with open(path, "w") as file:
+        file.write("let x be 1")
+
+    with pytest.raises(FileExistsError):
+        Server(path)
+
+    with open(path) as file:
+        assert file.read() == "let x be 1"
+
+def test_never_takes_over_a_live_socket(daemon):
+    with pytest.raises(FileExistsError):
+        Server(daemon)
+
+    with Client(daemon) as client:
+        assert client.run("1")["results"][0]["value"] == "1"
+
+def test_replaces_a_stale_socket(directory):
+    path = os.path.join(directory, "normal.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    server = Server(path)
+    server.server_close()
@@ -0,0 +1,64 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from normal import ENGINES, Session, compile_source
+
+# A smaller run of benchmarks/stress_sessions.py: many sessions run the same
+# compiled programs on a few threads, and none may see another's variables
+SOURCE = "\n".join([
+    "let total be seed * 2",
+    "total is now total + 1",
+    "if total > 500: total is now total - 500 else: total is now total + 7",
+    "constant doubled is total * 2",
+    "total + doubled",
+    "leak"
+])
+
+def expected(seed):
+    total = seed * 2 + 1
+    total = total - 500 if total > 500 else total + 7
+    return total + total * 2
+
+@pytest.fixture
+def switching():
+    # Switch threads as often as possible to shake out races
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+def work(engine, program, seed):
+    session = Session(engine)
+    session.table.declare("seed", seed, True)
+    results = session.execute(program)
+    assert [error for _, error in results[:5]] == [None] * 5
+    assert results[4][0] == expected(seed)
+    assert results[5][1] is not None
+
+    # Names private to one session are compiled concurrently, and only ever
+    # get slots in that session's table
+    declared, other = session.run(f"let session_own{seed} be total\nsession_own{seed - 1}")
+    assert declared[1] is None and other[1] is not None
+
+def test_sessions_are_isolated(switching):
+    programs = {engine: compile_source(SOURCE, engine) for engine in ENGINES}
+    engines = sorted(ENGINES)
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda seed: work(engines[seed % len(engines)], programs[engines[seed % len(engines)]], seed), range(500)))
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_shared_session_is_consistent(switching, engine):
+    session = Session(engine)
+    session.run("let counter be 0")
+    program = session.compile("counter is now counter + 1")
+
+    def increment(_):
+        for _ in range(50):
+            session.execute(program)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(increment, range(8)))
+
+    assert session.table.get("counter") == 400
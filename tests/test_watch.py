@@ -0,0 +1,38 @@
+import os
+
+from normal.watch import FileWatch
+
+def test_file_watch(tmp_path, capsys):
+    path = tmp_path / "watched.normal"
+    file_watch = FileWatch(str(path))
+
+    # A missing file is reported once, however many times it is polled
+    assert not file_watch.poll()
+    assert not file_watch.poll()
+    assert capsys.readouterr().out == "FileError: No such file or directory\n"
+
+    path.write_text("let x be 2\nx * 3")
+    assert file_watch.poll()
+    lines = capsys.readouterr().out.split("\n")
+    assert lines[:3] == [f"==> {path} <==", "2", "6"]
+    assert lines[3].startswith("-- 2 statements, reparsed 2, ran 2 from statement 1, ")
+
+    assert not file_watch.poll()
+    assert capsys.readouterr().out == ""
+
+    os.remove(path)
+    assert not file_watch.poll()
+    assert not file_watch.poll()
+    assert capsys.readouterr().out == "FileError: No such file or directory\n"
+
+    # Coming back runs it again, even with the same contents and time
+    path.write_text("let x be 2\nx * 3")
+    assert file_watch.poll()
+    assert capsys.readouterr().out.split("\n")[1:3] == ["2", "6"]
+
+def test_unreadable_file(tmp_path, capsys):
+    # Opening a directory fails after the stat succeeds
+    file_watch = FileWatch(str(tmp_path))
+    assert not file_watch.poll()
+    assert not file_watch.poll()
+    assert capsys.readouterr().out == "FileError: Is a directory\n"